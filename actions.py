@@ -3,11 +3,12 @@ from __future__ import annotations
 from typing import Optional, Tuple, TYPE_CHECKING
 
 import color
+from entity import Item
 import exceptions
 
 if TYPE_CHECKING:
     from engine import Engine
-    from entity import Actor, Entity, Item
+    from entity import Actor, Entity
 
 class Action:
     def __init__(self, entity: Actor) -> None:
@@ -42,12 +43,14 @@ class PickupAction(Action):
         actor_location_y = self.entity.y
         inventory = self.entity.inventory
 
-        for item in self.engine.game_map.items:
-            if actor_location_x == item.x and actor_location_y == item.y:
+        for item in self.engine.game_map.get_entities_at_location(
+            actor_location_x, actor_location_y
+        ):
+            if isinstance(item, Item):
                 if len(inventory.items) >= inventory.capacity:
                     raise exceptions.Impossible("Your inventory is full.")
                 
-                self.engine.game_map.entities.remove(item)
+                self.engine.game_map.remove_entity(item)
                 item.parent = self.entity.inventory
                 inventory.items.append(item)
 
@@ -108,7 +111,7 @@ class WaitAction(Action):
 class TakeStairsAction(Action):
     def perform(self) -> None:
         """
-        Take the stairs, if any exist at the entity's location.
+        Take the stairs down, if any exist at the entity's location.
         """
         if (self.entity.x, self.entity.y) == self.engine.game_map.downstairs_location:
             self.engine.game_world.generate_floor()
@@ -116,7 +119,21 @@ class TakeStairsAction(Action):
                 "You descend the staircase.", color.descend
             )
         else:
-            raise exceptions.Impossible("There are no stairs here.")
+            raise exceptions.Impossible("There are no stairs down here.")
+
+
+class AscendStairsAction(Action):
+    def perform(self) -> None:
+        """
+        Take the stairs up, if any exist at the entity's location.
+        """
+        if (self.entity.x, self.entity.y) == self.engine.game_map.upstairs_location:
+            self.engine.game_world.ascend()
+            self.engine.message_log.add_message(
+                "You ascend the staircase.", color.descend
+            )
+        else:
+            raise exceptions.Impossible("There are no stairs up here.")
 
 
 class ActionWithDirection(Action):
@@ -153,6 +170,9 @@ class MeleeAction(ActionWithDirection):
         
         damage = self.entity.fighter.power - target.fighter.defense
 
+        # The sound of fighting wakes up nearby monsters.
+        self.engine.wake_actors(*self.dest_xy, self.engine.game_world.ai_noise_radius)
+
         attack_desc = f"{self.entity.name.capitalize()} attacks {target.name}"
         if self.entity is self.engine.player:
             attack_color = color.player_atk
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np # type: ignore
+
+import color
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from entity import Actor
+
+
+def describe_targets(names: Sequence[str]) -> str:
+    """Return a short description of a group of targets, such as "Ninja and Ronin"."""
+    if len(names) == 1:
+        return names[0]
+    if len(names) <= 3:
+        return f"{', '.join(names[:-1])} and {names[-1]}"
+    return f"{len(names)} creatures"
+
+
+def resolve_area_damage(
+    engine: Engine,
+    center_xy: Tuple[int, int],
+    radius: float,
+    damage: int,
+    message: str,
+    fg: Tuple[int, int, int] = color.white,
+) -> int:
+    """
+    Deal `damage` to every living actor within `radius` of `center_xy` as one batch.
+
+    The affected actors and their new HP are worked out with NumPy, then written back in one pass.
+    Instead of a message per hit, a single log entry is added, where `message` is formatted with
+    `targets` (a description of who was hit) and `damage`.
+
+    Returns the number of actors hit.
+    """
+    game_map = engine.game_map
+    actors: List[Actor] = game_map.get_actors_in_radius(*center_xy, radius)
+    if not actors:
+        return 0
+
+    store = game_map.entity_store
+    slots = np.array([store.slots[actor] for actor in actors], dtype=np.intp)
+    new_hp = np.maximum(store.hp[slots] - damage, 0).tolist()
+
+    names = [actor.name for actor in actors]
+    killed_names: List[str] = []
+    xp_gained = 0
+
+    for actor, name, hp in zip(actors, names, new_hp):
+        if hp == 0 and actor is not engine.player:
+            # Deaths are reported together below, rather than one message each.
+            xp_gained += actor.level.xp_given
+            actor.fighter.die(add_message=False)
+            killed_names.append(name)
+        actor.fighter.hp = hp
+
+    text = message.format(targets=describe_targets(names), damage=damage)
+    if killed_names:
+        verb = "is" if len(killed_names) == 1 else "are"
+        text = f"{text} {describe_targets(killed_names)} {verb} killed."
+    engine.message_log.add_message(text, fg)
+
+    if xp_gained:
+        engine.player.level.add_xp(xp_gained)
+
+    return len(actors)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, TYPE_CHECKING
+
+import checkpoint
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+class Autosaver:
+    """
+    Checkpoints a game every `interval` turns, writing each checkpoint in the background.
+
+    Only the snapshot of the game is taken on the main thread, which pickles the units of the
+    current floor and copies its arrays, so its pause grows with the floor the player is on rather
+    than the whole game. Finding what changed, compressing and writing the checkpoint happen on a
+    background thread. At most one checkpoint is written at a time: if the last one is still being
+    written when the next is due, the snapshot waits for a later turn, so saves which overlap are
+    coalesced into one.
+    """
+
+    def __init__(self, engine: Engine, filename: str, interval: int = 20):
+        if interval < 1:
+            raise ValueError(f"The autosave interval must be at least one turn, not {interval}.")
+        self.engine = engine
+        self.filename = filename
+        self.interval = interval
+        self.last_save_turn = engine.turn
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending: Optional[Future[int]] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a checkpoint is still being written."""
+        return self._pending is not None and not self._pending.done()
+
+    def on_turn(self) -> None:
+        """Start a checkpoint if one is due and the last one has finished."""
+        if self.engine.turn - self.last_save_turn < self.interval or self.busy:
+            return
+        self._finish()
+
+        writer = checkpoint.writer_for(self.engine, self.filename)
+        self._pending = self._executor.submit(writer.write, *writer.snapshot())
+        self.last_save_turn = self.engine.turn
+
+    def _finish(self) -> None:
+        """Wait for the checkpoint being written, raising any error from writing it."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending.result()
+
+    def flush(self) -> None:
+        """Wait for the checkpoint being written, so the file is up to date."""
+        self._finish()
+
+    def close(self) -> None:
+        """Stop autosaving, once the checkpoint being written has finished."""
+        try:
+            self._finish()
+        finally:
+            self._executor.shutdown()
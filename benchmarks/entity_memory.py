@@ -0,0 +1,110 @@
+"""Compare the memory and save size of slotted entities against their __dict__ equivalents.
+
+Run from the project root with: python -m benchmarks.entity_memory
+"""
+from __future__ import annotations
+
+import copy
+import pickle
+import sys
+import tracemalloc
+from enum import Enum
+from typing import Any, Callable, Dict, List
+
+import entity_factories
+from entity import Entity
+
+SAMPLE_PROTOTYPES = [
+    entity_factories.ashigaru,
+    entity_factories.samurai,
+    entity_factories.health_potion,
+    entity_factories.fireball_scroll,
+    entity_factories.katana,
+    entity_factories.bow,
+]
+
+
+def _dict_class(cls: type) -> type:
+    """Return a plain class with a per-instance __dict__ standing in for a slotted class."""
+    name = f"Dict{cls.__name__}"
+    module = sys.modules[__name__]
+    if not hasattr(module, name):
+        dict_cls = type(name, (), {"__module__": __name__})
+        setattr(module, name, dict_cls)
+    return getattr(module, name)
+
+
+def _slot_names(cls: type) -> List[str]:
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return names
+
+
+def to_dict_layout(obj: Any, memo: Dict[int, Any]) -> Any:
+    """Copy an object graph, turning every slotted object into an equivalent __dict__ object."""
+    if id(obj) in memo:
+        return memo[id(obj)]
+    if isinstance(obj, list):
+        result: Any = []
+        memo[id(obj)] = result
+        result.extend(to_dict_layout(value, memo) for value in obj)
+        return result
+    if isinstance(obj, Enum) or isinstance(obj, type):
+        return obj
+    if not hasattr(type(obj), "__slots__"):
+        if not hasattr(obj, "__dict__"):
+            return obj
+        # Objects which already use a __dict__, such as AIs, may point back into the graph.
+        result = object.__new__(type(obj))
+        memo[id(obj)] = result
+        for name, value in vars(obj).items():
+            setattr(result, name, to_dict_layout(value, memo))
+        return result
+
+    result = _dict_class(type(obj))()
+    memo[id(obj)] = result
+    for name in _slot_names(type(obj)):
+        if hasattr(obj, name):
+            setattr(result, name, to_dict_layout(getattr(obj, name), memo))
+    return result
+
+
+def measure(make: Callable[[], Any], count: int) -> int:
+    """Return the bytes allocated per object when `count` objects are made by `make`."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    objects = [make() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) // count
+
+
+def main(count: int = 2000) -> None:
+    print(f"{'prototype':<20}{'dict B':>10}{'slots B':>10}{'dict pickle':>14}{'slots pickle':>14}")
+
+    totals = [0, 0, 0, 0]
+    for prototype in SAMPLE_PROTOTYPES:
+        assert isinstance(prototype, Entity)
+        dict_prototype = to_dict_layout(prototype, {})
+
+        row = [
+            measure(lambda: copy.deepcopy(dict_prototype), count),
+            measure(lambda: copy.deepcopy(prototype), count),
+            len(pickle.dumps(dict_prototype)),
+            len(pickle.dumps(prototype)),
+        ]
+        totals = [total + value for total, value in zip(totals, row)]
+        print(f"{prototype.name:<20}" + "".join(f"{value:>10}" for value in row[:2])
+              + "".join(f"{value:>14}" for value in row[2:]))
+
+    samples = len(SAMPLE_PROTOTYPES)
+    print(f"{'average':<20}" + "".join(f"{value // samples:>10}" for value in totals[:2])
+          + "".join(f"{value // samples:>14}" for value in totals[2:]))
+    print(f"Slotted entities use {1 - totals[1] / totals[0]:.0%} less memory per entity.")
+
+
+if __name__ == "__main__":
+    main()
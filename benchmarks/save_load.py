@@ -0,0 +1,120 @@
+"""Compare saving and loading with the sectioned save format against pickling the whole engine
+with LZMA, as saves used to be, and check that a checkpoint loads back the same game.
+
+Run from the project root with: python -m benchmarks.save_load
+"""
+from __future__ import annotations
+
+import io
+import lzma
+import os
+import pickle
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+import checkpoint
+from engine import Engine
+import save_format
+import setup_game
+
+
+def legacy_save(engine: Engine) -> bytes:
+    return lzma.compress(pickle.dumps(engine))
+
+
+def legacy_load(data: bytes) -> Engine:
+    return pickle.loads(lzma.decompress(data))
+
+
+def sectioned_save(codec: str) -> Callable[[Engine], bytes]:
+    def save(engine: Engine) -> bytes:
+        file = io.BytesIO()
+        save_format.dump_engine(engine, file, codec)
+        return file.getvalue()
+    return save
+
+
+def sectioned_load(data: bytes) -> Engine:
+    return save_format.load_engine(io.BytesIO(data))
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_engine(map_width: int, map_height: int, chunk_size: int, messages: int) -> Engine:
+    engine = setup_game.new_game(
+        seed=1, map_width=map_width, map_height=map_height, chunk_size=chunk_size or None
+    )
+    for i in range(messages):
+        engine.message_log.add_message(f"The Ashigaru attacks you for {i % 7} hit points.")
+    return engine
+
+
+def check_checkpoint(engine: Engine) -> None:
+    """
+    Checkpoint a game with a full record and a delta, and check how it loads back, including after
+    a crash cut the last delta short.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "checkpoint.sav")
+        checkpoint.save_checkpoint(engine, filename)
+        engine.message_log.add_message("A delta is written for this message.")
+        checkpoint.save_checkpoint(engine, filename)
+
+        loaded = checkpoint.load_checkpoint(filename)
+        inventory = loaded.player.inventory
+        assert inventory.parent is loaded.player
+        assert len(inventory.items) == len(engine.player.inventory.items)
+        for item in inventory.items:
+            assert item.parent is inventory, item.name
+        assert len(loaded.message_log) == len(engine.message_log)
+
+        # A delta cut short by a crash is skipped, and the game carries on from the one before.
+        size = os.path.getsize(filename)
+        loaded.message_log.add_message("This delta is cut short.")
+        checkpoint.save_checkpoint(loaded, filename)
+        checkpoint.release_file(filename)
+        with open(filename, "r+b") as f:
+            f.truncate((size + os.path.getsize(filename)) // 2)
+        resumed = checkpoint.load_checkpoint(filename)
+        assert len(resumed.message_log) == len(engine.message_log)
+        resumed.message_log.add_message("Written after resuming.")
+        checkpoint.save_checkpoint(resumed, filename)
+
+        reloaded = checkpoint.load_checkpoint(filename)
+        assert reloaded.message_log.messages[-1].plain_text == "Written after resuming."
+        checkpoint.release_file(filename)
+
+
+def main(repeat: int = 3) -> None:
+    scenarios = [
+        ("80x43 map", (80, 43, 0, 1000)),
+        ("2000x2000 chunked", (2000, 2000, 50, 5000)),
+    ]
+    formats: List[Tuple[str, Callable[[Engine], bytes], Callable[[bytes], Engine]]] = [
+        ("pickle + lzma", legacy_save, legacy_load),
+        ("sectioned zlib", sectioned_save("zlib"), sectioned_load),
+        ("sectioned none", sectioned_save("none"), sectioned_load),
+    ]
+
+    for label, arguments in scenarios:
+        engine = make_engine(*arguments)
+        check_checkpoint(engine)
+        print(f"{label}:")
+        print(f"  {'format':<18}{'save ms':>10}{'load ms':>10}{'size KiB':>11}")
+        for name, save, load in formats:
+            data = save(engine)
+            save_time = best_time(lambda: save(engine), repeat)
+            load_time = best_time(lambda: load(data), repeat)
+            print(f"  {name:<18}{save_time * 1000:>10.1f}{load_time * 1000:>10.1f}{len(data) / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare spawning entities from prototype recipes against deep copying the prototypes.
+
+Run from the project root with: python -m benchmarks.spawn
+"""
+from __future__ import annotations
+
+import copy
+import timeit
+from enum import Enum
+from typing import Any, Dict, List
+
+import entity_factories
+from entity import Entity, prototype_recipes
+
+
+def _state(obj: Any) -> Dict[str, Any]:
+    state = dict(getattr(obj, "__dict__", {}))
+    for klass in type(obj).__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
+
+
+def same_structure(a: Any, b: Any, pairs: Dict[int, int]) -> bool:
+    """Return True if two object graphs are copies of each other, including where they point back."""
+    if id(a) in pairs:
+        return pairs[id(a)] == id(b)
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (int, float, str, bytes, type(None), Enum, type)):
+        return a == b
+    pairs[id(a)] = id(b)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same_structure(x, y, pairs) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same_structure(a[k], b[k], pairs) for k in a)
+    state_a, state_b = _state(a), _state(b)
+    return state_a.keys() == state_b.keys() and all(
+        same_structure(state_a[k], state_b[k], pairs) for k in state_a
+    )
+
+
+def main(number: int = 2000) -> None:
+    prototypes: List[Entity] = [
+        value for value in vars(entity_factories).values()
+        if isinstance(value, Entity) and value in prototype_recipes
+    ]
+
+    print(f"{'prototype':<24}{'deepcopy us':>14}{'recipe us':>12}{'speedup':>10}")
+    total_deepcopy = total_recipe = 0.0
+    for prototype in prototypes:
+        assert same_structure(copy.deepcopy(prototype), prototype.clone(), {}), prototype.name
+
+        deepcopy_time = timeit.timeit(lambda: copy.deepcopy(prototype), number=number) / number
+        recipe_time = timeit.timeit(prototype.clone, number=number) / number
+        total_deepcopy += deepcopy_time
+        total_recipe += recipe_time
+        print(
+            f"{prototype.name:<24}{deepcopy_time * 1e6:>14.1f}{recipe_time * 1e6:>12.1f}"
+            f"{deepcopy_time / recipe_time:>9.1f}x"
+        )
+
+    print(
+        f"{'total':<24}{total_deepcopy * 1e6:>14.1f}{total_recipe * 1e6:>12.1f}"
+        f"{total_deepcopy / total_recipe:>9.1f}x"
+    )
+    print(f"All {len(prototypes)} recipes build the same entity as a deep copy.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measure how long taking the stairs takes, with and without generating floors in the background.
+
+Run from the project root with: python -m benchmarks.stair_latency
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from typing import List
+
+from engine import Engine
+import entity_factories
+from game_map import GameWorld
+
+
+def stair_latencies(pregenerate: bool, floors: int, explore_time: float) -> List[float]:
+    """Return the latency of each descent, waiting `explore_time` seconds on every floor."""
+    engine = Engine(player=entity_factories.player.clone())
+    engine.game_world = GameWorld(
+        engine=engine,
+        max_rooms=30,
+        room_min_size=6,
+        room_max_size=10,
+        map_width=80,
+        map_height=43,
+        seed=1,
+        pregenerate=pregenerate,
+    )
+    engine.game_world.generate_floor()
+
+    latencies = []
+    for _ in range(floors):
+        time.sleep(explore_time) # Stands in for the player exploring the floor.
+        engine.game_world.generate_floor()
+        latencies.append(engine.game_world.last_floor_latency)
+    return latencies
+
+
+def main(floors: int = 20, explore_time: float = 0.1) -> None:
+    print(f"{'mode':<16}{'mean ms':>10}{'median ms':>12}{'max ms':>10}")
+    for label, pregenerate in (("synchronous", False), ("pregenerated", True)):
+        latencies = [latency * 1000 for latency in stair_latencies(pregenerate, floors, explore_time)]
+        print(
+            f"{label:<16}{statistics.mean(latencies):>10.2f}"
+            f"{statistics.median(latencies):>12.2f}{max(latencies):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
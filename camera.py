@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_map import GameMap
+
+
+class Camera:
+    """
+    The part of the map shown on screen, which is `width` by `height` tiles from the top left of
+    the console.
+
+    The camera follows a point, such as the player, but never scrolls past the edges of the map.
+    Maps smaller than the screen are shown whole.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        # The map position shown at the top left of the screen, and how much of the map is shown.
+        self.x = 0
+        self.y = 0
+        self.view_width = width
+        self.view_height = height
+
+    def center_on(self, x: int, y: int, game_map: GameMap) -> None:
+        self.view_width = min(self.width, game_map.width)
+        self.view_height = min(self.height, game_map.height)
+        self.x = max(0, min(x - self.view_width // 2, game_map.width - self.view_width))
+        self.y = max(0, min(y - self.view_height // 2, game_map.height - self.view_height))
+
+    @property
+    def view(self) -> Tuple[slice, slice]:
+        """Return the part of the map on screen as a 2D array index."""
+        return slice(self.x, self.x + self.view_width), slice(self.y, self.y + self.view_height)
+
+    def in_view(self, x: int, y: int) -> bool:
+        """Return True if the map position (x, y) is on screen."""
+        return (
+            self.x <= x < self.x + self.view_width and self.y <= y < self.y + self.view_height
+        )
+
+    def map_to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        return x - self.x, y - self.y
+
+    def screen_to_map(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """Return the map position under the screen tile (x, y), or None if it is not on the map."""
+        if 0 <= x < self.view_width and 0 <= y < self.view_height:
+            return x + self.x, y + self.y
+        return None
@@ -0,0 +1,666 @@
+"""
+Checkpoint files, which save a game as one full snapshot followed by small deltas.
+
+Every entity, inventory, map and stored floor in a game is saved as a separate unit: the unit's
+own attributes are pickled on their own, with any other unit they refer to (and the engine and
+message log) replaced by a reference. So a checkpoint only needs to write the units whose pickled
+state changed since the last one, the cells of map arrays which changed, the messages logged since
+and the engine's own small state. Floors the player has left cannot change until they return, so
+their units are only pickled once.
+
+A file is the `MAGIC` bytes followed by records. The first checkpoint of a floor writes a new file
+holding one full record, and later checkpoints append deltas to it until there are `max_deltas` of
+them, at which point the file is compacted back into a single full record. Each record has:
+
+- A `RECORD_HEADER`, then the length of each of its buffers.
+- The record as a zlib compressed pickle, without its arrays or messages.
+- Its new messages as zlib compressed JSON, in chunks of `MESSAGE_CHUNK` messages.
+- The raw data of its arrays, each aligned to `BUFFER_ALIGNMENT` bytes, which are stored out of
+  band with pickle protocol 5.
+
+As the arrays are stored raw, a loaded game's map arrays are memory mapped from the file instead of
+read, and only the last `MESSAGE_TAIL` messages are decoded until older ones are looked at. So a
+game is loaded in about the same time however large its maps and message log are.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np # type: ignore
+
+from components.inventory import Inventory
+from entity import Entity
+from floor_cache import StoredFloor
+from game_map import GameMap
+from message_log import Message, MessageLog
+import save_format
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+MAGIC = b"RLGCKPT2"
+FULL = b"F"
+DELTA = b"D"
+# Kind, pickle length, messages length and number of buffers.
+RECORD_HEADER = struct.Struct("<cIII")
+BUFFER_LENGTH = struct.Struct("<Q")
+BUFFER_ALIGNMENT = 64
+MESSAGE_CHUNK = 256
+MESSAGE_TAIL = 100
+
+# Inventories are units as well as entities, since the items in one refer to it as their parent.
+UNIT_TYPES = (Entity, Inventory, GameMap, StoredFloor)
+
+
+def _digest(state: bytes) -> bytes:
+    """Return a hash of a unit's pickled state, which is remembered instead of the state itself."""
+    return hashlib.blake2b(state, digest_size=16).digest()
+
+
+def _changed_cells(saved: np.ndarray, array: np.ndarray) -> np.ndarray:
+    """Return the flat indices, in C order, of the cells which differ between two arrays."""
+    order = "F" if array.flags.f_contiguous else "C"
+    if array.dtype.fields is None or not (
+        array.flags[f"{order}_CONTIGUOUS"] and saved.flags[f"{order}_CONTIGUOUS"]
+    ):
+        return np.flatnonzero(saved != array)
+    # Comparing structured arrays such as tiles field by field is slow, so their bytes are
+    # compared instead.
+    changed_bytes = np.flatnonzero(
+        array.reshape(-1, order=order).view(np.uint8) != saved.reshape(-1, order=order).view(np.uint8)
+    )
+    cells = np.unique(changed_bytes // array.dtype.itemsize)
+    if order == "F":
+        cells = np.ravel_multi_index(np.unravel_index(cells, array.shape, order="F"), array.shape)
+    return cells
+
+
+def _copy_array(array: np.ndarray) -> np.ndarray:
+    """Return a copy of an array with the same memory layout."""
+    order = "F" if array.flags.f_contiguous else "C"
+    if array.dtype.fields is None or not array.flags[f"{order}_CONTIGUOUS"]:
+        return array.copy(order="K")
+    # Structured arrays such as tiles copy many times faster as bytes.
+    data = array.reshape(-1, order=order).view(np.uint8).copy()
+    return data.view(array.dtype).reshape(array.shape, order=order)
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    """Return True if an array's data is in a memory mapped checkpoint file."""
+    base = array.base
+    while isinstance(base, np.ndarray):
+        base = base.base
+    return isinstance(base, (memoryview, mmap.mmap, pickle.PickleBuffer))
+
+
+def _unit_state(unit: Any) -> Dict[str, Any]:
+    """Return the attributes of a unit which are saved, in the same form pickle would save them."""
+    state = unit.__getstate__()
+    if isinstance(state, tuple): # Slotted classes return (__dict__, slots).
+        instance_dict, slots = state
+        state = {**(instance_dict or {}), **(slots or {})}
+    return dict(state)
+
+
+class _UnitPickler(pickle.Pickler):
+    """Pickles one unit's state, replacing references to units, the engine and message log."""
+
+    def __init__(self, file: BinaryIO, writer: CheckpointWriter, engine: Engine):
+        super().__init__(file, protocol=5)
+        self.writer = writer
+        self.engine = engine
+
+    def persistent_id(self, obj: Any) -> Any:
+        if isinstance(obj, UNIT_TYPES):
+            return "unit", self.writer.unit_id(obj)
+        if obj is self.engine:
+            return "engine"
+        if obj is self.engine.message_log:
+            return "message_log"
+        return None
+
+
+class _UnitUnpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, units: Dict[int, Any], engine: Any, message_log: MessageLog):
+        super().__init__(file)
+        self.units = units
+        self.engine = engine
+        self.message_log = message_log
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "engine":
+            return self.engine
+        if pid == "message_log":
+            return self.message_log
+        kind, unit_id = pid
+        return self.units[unit_id]
+
+
+class _KeptFloor:
+    """The pickled units of a floor the player has left, which cannot change until they return."""
+
+    def __init__(self) -> None:
+        # None for a stored floor, whose state is the whole floor and not worth keeping.
+        self.states: Dict[int, Optional[Tuple[str, str, bytes]]] = {}
+        self.digests: Dict[int, bytes] = {}
+        self.arrays: Dict[Tuple[int, str], np.ndarray] = {}
+        # The units outside the floor which its units refer to.
+        self.references: Set[int] = set()
+
+
+class CheckpointWriter:
+    """Writes checkpoints of one engine to one file, remembering what was saved last time."""
+
+    def __init__(self, filename: str, engine: Engine, max_deltas: int = 50):
+        self.filename = filename
+        self.engine = engine
+        self.max_deltas = max_deltas
+
+        # Unit ids, by the id() of the unit, and the units themselves, which keeps them alive.
+        self._unit_ids: Dict[int, int] = {}
+        self._units: Dict[int, Any] = {}
+        self._next_unit_id = 0
+        self._queue: List[Any] = []
+
+        # What was written by the last checkpoint.
+        self._saved_states: Dict[int, bytes] = {} # Digests, as stored floors can be large.
+        self._saved_arrays: Dict[Tuple[int, str], np.ndarray] = {}
+        # The `tiles_version` of each map, so tiles are only compared after they were edited.
+        self._saved_tile_versions: Dict[int, int] = {}
+        self._saved_messages = 0
+        self._saved_floor: Optional[int] = None
+        self._deltas = 0
+        self._file_size = 0
+        # The mappings of the file a game was loaded from, which its arrays are still read from.
+        self._mappings: List[mmap.mmap] = []
+
+        # Floors the player has left, pickled once and kept until the player returns. Floors in
+        # memory are keyed by their `FloorCache.put_numbers` entry, and stored floors by unit id.
+        self._kept: Dict[Tuple[str, int], _KeptFloor] = {}
+        self._references: List[int] = []
+
+    def unit_id(self, unit: Any) -> int:
+        """Return the id of a unit, queueing it to be saved if it has not been seen yet."""
+        unit_id = self._unit_ids.get(id(unit))
+        if unit_id is None:
+            unit_id = self._next_unit_id
+            self._next_unit_id += 1
+            self._unit_ids[id(unit)] = unit_id
+            self._units[unit_id] = unit
+        if unit_id not in self._seen:
+            self._seen.add(unit_id)
+            self._queue.append(unit)
+        self._references.append(unit_id)
+        return unit_id
+
+    def _pickle(self, obj: Any) -> bytes:
+        data = io.BytesIO()
+        _UnitPickler(data, self, self.engine).dump(obj)
+        return data.getvalue()
+
+    def _kept_key(self, unit: Any, unit_id: int, put_numbers: Dict[int, int]) -> Optional[Tuple[str, int]]:
+        """Return the key in `_kept` of the floor a unit was left on, or None if it can change."""
+        if isinstance(unit, StoredFloor):
+            return ("stored", unit_id)
+        put_number = put_numbers.get(id(getattr(unit, "gamemap", None)))
+        return None if put_number is None else ("resident", put_number)
+
+    def _collect(self, full: bool) -> Tuple[
+        bytes,
+        Dict[int, Tuple[str, str, bytes]],
+        Dict[int, bytes],
+        Dict[Tuple[int, str], np.ndarray],
+    ]:
+        """
+        Pickle the engine and every unit reachable from it, returning the engine, the units, their
+        digests and their arrays.
+
+        The units of a kept floor are not pickled again, and the keys of their arrays are left in
+        `_kept_array_keys`.
+        """
+        floors = self.engine.game_world.floors
+        put_numbers = {
+            id(game_map): floors.put_numbers[floor] for floor, game_map in floors.resident.items()
+        }
+
+        self._seen = set()
+        root = self._pickle(_unit_state(self.engine))
+
+        states: Dict[int, Tuple[str, str, bytes]] = {}
+        digests: Dict[int, bytes] = {}
+        arrays: Dict[Tuple[int, str], np.ndarray] = {}
+        self._kept_array_keys: Set[Tuple[int, str]] = set()
+        self._tile_versions: Dict[int, int] = {}
+        kept: Dict[Tuple[str, int], _KeptFloor] = {}
+        while self._queue:
+            unit = self._queue.pop()
+            unit_id = self._unit_ids[id(unit)]
+            if isinstance(unit, GameMap):
+                self._tile_versions[unit_id] = unit.tiles_version
+
+            key = self._kept_key(unit, unit_id, put_numbers)
+            floor = self._kept.get(key) if key is not None else None
+            if key not in kept and floor is not None and not (full and None in floor.states.values()):
+                # Everything on the floor is added at once, without looking at its units.
+                kept[key] = floor
+                self._seen.update(floor.digests)
+                states.update((i, state) for i, state in floor.states.items() if state is not None)
+                digests.update(floor.digests)
+                arrays.update(floor.arrays)
+                self._kept_array_keys.update(floor.arrays)
+                for reference in floor.references:
+                    self.unit_id(self._units[reference])
+            if key in kept and unit_id in kept[key].digests:
+                continue
+
+            state = _unit_state(unit)
+            unit_arrays = {
+                (unit_id, name): state.pop(name) for name, value in list(state.items())
+                if isinstance(value, np.ndarray)
+            }
+            arrays.update(unit_arrays)
+            cls = type(unit)
+            self._references = []
+            states[unit_id] = (cls.__module__, cls.__qualname__, self._pickle(state))
+            digests[unit_id] = _digest(states[unit_id][2])
+            if key is not None:
+                floor = kept.setdefault(key, _KeptFloor())
+                floor.states[unit_id] = None if isinstance(unit, StoredFloor) else states[unit_id]
+                floor.digests[unit_id] = digests[unit_id]
+                floor.arrays.update(unit_arrays)
+                floor.references.update(self._references)
+        for floor in kept.values():
+            floor.references.difference_update(floor.digests)
+        # Floors the player went back to are dropped.
+        self._kept = kept
+
+        # Forget units which can no longer be reached.
+        for unit_id in set(self._units) - self._seen:
+            del self._unit_ids[id(self._units.pop(unit_id))]
+        return root, states, digests, arrays
+
+    def _needs_full(self) -> bool:
+        return (
+            self._saved_floor != self.engine.game_world.current_floor
+            or self._deltas >= self.max_deltas
+            or not os.path.exists(self.filename)
+            or os.path.getsize(self.filename) != self._file_size
+        )
+
+    def snapshot(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Return whether the next checkpoint is a full one, and what to write for it.
+
+        Only the units which may have changed since the last checkpoint are pickled, and only their
+        arrays copied, so the pause grows with the floor the player is on rather than the whole
+        game. Finding what changed is left to `write`. The snapshot shares nothing with the game,
+        so it can be written while the game carries on.
+        """
+        full = self._needs_full()
+        if full:
+            # The file is about to be replaced, which Windows refuses while it is mapped.
+            self.release_file()
+        root, states, digests, arrays = self._collect(full)
+        message_log = self.engine.message_log
+
+        copies = {}
+        for key, array in arrays.items():
+            unit_id, name = key
+            if not full and key in self._saved_arrays and (
+                key in self._kept_array_keys # On a floor the player has left.
+                or name == "tiles"
+                and self._saved_tile_versions.get(unit_id) == self._tile_versions[unit_id]
+            ):
+                continue
+            copies[key] = _copy_array(array)
+
+        # The last message may have stacked since, so it is always written again.
+        message_start = 0 if full else max(0, self._saved_messages - 1)
+        taken = {
+            "root": root,
+            "units": states,
+            "digests": digests,
+            "array_keys": set(arrays),
+            "arrays": copies,
+            "messages": (message_start, save_format.message_rows(message_log.since(message_start))),
+        }
+
+        self._saved_tile_versions = self._tile_versions
+        self._saved_messages = len(message_log)
+        self._saved_floor = self.engine.game_world.current_floor
+        if full:
+            self._deltas = 0
+        else:
+            self._deltas += 1
+        return full, taken
+
+    def _record(self, full: bool, taken: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the record to write for a snapshot, with only what changed for a delta."""
+        digests = taken["digests"]
+        arrays = taken["arrays"]
+        if full:
+            self._saved_arrays = arrays
+            record = {
+                "root": taken["root"],
+                "units": taken["units"],
+                "removed": [],
+                "arrays": dict(arrays),
+                "array_changes": {},
+            }
+        else:
+            array_changes = {}
+            full_arrays = {}
+            for key in self._saved_arrays.keys() - taken["array_keys"]:
+                del self._saved_arrays[key]
+            for key, array in arrays.items():
+                saved = self._saved_arrays.get(key)
+                if saved is None or saved.shape != array.shape or saved.dtype != array.dtype:
+                    full_arrays[key] = self._saved_arrays[key] = array
+                    continue
+                changed = _changed_cells(saved, array)
+                if len(changed):
+                    array_changes[key] = (changed, array.flat[changed])
+                    saved.flat[changed] = array_changes[key][1]
+            record = {
+                "root": taken["root"],
+                "units": {
+                    unit_id: state for unit_id, state in taken["units"].items()
+                    if self._saved_states.get(unit_id) != digests[unit_id]
+                },
+                "removed": [unit_id for unit_id in self._saved_states if unit_id not in digests],
+                "arrays": full_arrays,
+                "array_changes": array_changes,
+            }
+        record["messages"] = taken["messages"]
+        self._saved_states = digests
+        return record
+
+    def write(self, full: bool, taken: Dict[str, Any]) -> int:
+        """
+        Find what changed in a snapshot from `snapshot`, then compress and write it, returning the
+        number of bytes written.
+
+        A full record replaces the file through a temporary file, so a crash leaves either the old
+        file or the new one. A delta is appended, and a crash part way leaves a cut short record
+        which is ignored when loading.
+        """
+        record = self._record(full, taken)
+        offset = len(MAGIC) if full else self._file_size
+        parts = _encode_record(FULL if full else DELTA, record, offset)
+        length = sum(len(part) for part in parts)
+        if full:
+            temporary = f"{self.filename}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(MAGIC)
+                f.writelines(parts)
+            os.replace(temporary, self.filename)
+            self._file_size = len(MAGIC) + length
+        else:
+            with open(self.filename, "ab") as f:
+                f.writelines(parts)
+            self._file_size += length
+        return length
+
+    def save(self) -> int:
+        """Write a checkpoint, returning the number of bytes written."""
+        return self.write(*self.snapshot())
+
+    def release_file(self) -> None:
+        """
+        Copy everything still read from the memory mapped file a game was loaded from into memory,
+        and close the mappings, so the file can be replaced or deleted.
+        """
+        if not self._mappings:
+            return
+        self.engine.message_log.messages # Decodes the older messages left in the file.
+        for unit in self._units.values():
+            for name, value in _unit_state(unit).items():
+                if isinstance(value, np.ndarray) and _is_mapped(value):
+                    setattr(unit, name, _copy_array(value))
+        self._saved_arrays = {
+            key: _copy_array(array) if _is_mapped(array) else array
+            for key, array in self._saved_arrays.items()
+        }
+        self._kept.clear() # Its arrays may still be the mapped ones.
+        mappings, self._mappings = self._mappings, []
+        for mapping in mappings:
+            mapping.close()
+
+
+# The writer for each checkpoint file, so repeated saves of the same game can write deltas.
+_writers: Dict[str, CheckpointWriter] = {}
+
+
+def writer_for(engine: Engine, filename: str) -> CheckpointWriter:
+    """Return the writer checkpointing a game to a file, starting a new one for a new game."""
+    writer = _writers.get(filename)
+    if writer is None or writer.engine is not engine:
+        writer = _writers[filename] = CheckpointWriter(filename, engine)
+    return writer
+
+
+def save_checkpoint(engine: Engine, filename: str) -> int:
+    """Checkpoint a game to a file, returning the number of bytes written."""
+    return writer_for(engine, filename).save()
+
+
+def release_file(filename: str) -> None:
+    """Stop reading a loaded game from its checkpoint file, before the file is deleted."""
+    writer = _writers.get(filename)
+    if writer is not None:
+        writer.release_file()
+
+
+def is_checkpoint_file(filename: str) -> bool:
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _encode_record(kind: bytes, record: Dict[str, Any], offset: int) -> List[Any]:
+    """Return the parts of a record which starts `offset` bytes into its file."""
+    message_start, rows = record["messages"]
+    chunks = [
+        zlib.compress(json.dumps(rows[i:i + MESSAGE_CHUNK]).encode(), 1)
+        for i in range(0, len(rows), MESSAGE_CHUNK)
+    ]
+    buffers: List[pickle.PickleBuffer] = []
+    payload = zlib.compress(
+        pickle.dumps(
+            {**record, "messages": (message_start, len(rows), [len(chunk) for chunk in chunks])},
+            protocol=5,
+            buffer_callback=buffers.append,
+        ),
+        1,
+    )
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    parts: List[Any] = [RECORD_HEADER.pack(kind, len(payload), sum(map(len, chunks)), len(raw_buffers))]
+    parts += [BUFFER_LENGTH.pack(raw.nbytes) for raw in raw_buffers]
+    parts.append(payload)
+    parts += chunks
+    position = offset + sum(len(part) for part in parts)
+    for raw in raw_buffers:
+        padding = -position % BUFFER_ALIGNMENT
+        parts += [bytes(padding), raw]
+        position += padding + raw.nbytes
+    return parts
+
+
+def _read_records(data: memoryview) -> Tuple[List[Tuple[bytes, Dict[str, Any], memoryview]], int]:
+    """
+    Return the kind, record and messages section of every complete record in a file's data, and
+    the offset where the last complete record ends.
+
+    The arrays of the records are views of `data`. A record cut short, such as by a crash, is
+    ignored.
+    """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a checkpoint file.")
+    records = []
+    position = end = len(MAGIC)
+    while position + RECORD_HEADER.size <= len(data):
+        kind, payload_length, messages_length, buffer_count = RECORD_HEADER.unpack_from(data, position)
+        position += RECORD_HEADER.size
+        if position + buffer_count * BUFFER_LENGTH.size > len(data):
+            break
+        buffer_lengths = [
+            BUFFER_LENGTH.unpack_from(data, position + i * BUFFER_LENGTH.size)[0]
+            for i in range(buffer_count)
+        ]
+        position += buffer_count * BUFFER_LENGTH.size
+        payload = data[position:position + payload_length]
+        position += payload_length
+        messages = data[position:position + messages_length]
+        position += messages_length
+        buffers = []
+        for length in buffer_lengths:
+            position += -position % BUFFER_ALIGNMENT
+            buffers.append(data[position:position + length])
+            position += length
+        if position > len(data):
+            break
+        records.append((kind, pickle.loads(zlib.decompress(payload), buffers=buffers), messages))
+        end = position
+    return records, end
+
+
+def _replay(
+    records: List[Tuple[bytes, Dict[str, Any], memoryview]]
+) -> Tuple[bytes, Dict[int, Tuple[str, str, bytes]], Dict[Tuple[int, str], np.ndarray]]:
+    """Return the engine, units and arrays from applying each record in turn."""
+    root = b""
+    states: Dict[int, Tuple[str, str, bytes]] = {}
+    arrays: Dict[Tuple[int, str], np.ndarray] = {}
+    for _, record, _ in records:
+        root = record["root"]
+        states.update(record["units"])
+        for unit_id in record["removed"]:
+            states.pop(unit_id, None)
+        arrays.update(record["arrays"])
+        for key, (indices, values) in record["array_changes"].items():
+            arrays[key].flat[indices] = values
+    return root, states, arrays
+
+
+def _message_reader(
+    records: List[Tuple[bytes, Dict[str, Any], memoryview]]
+) -> Tuple[int, Callable[[int, int], List[Message]]]:
+    """
+    Return the number of messages the records add up to, and a function which decodes the
+    messages in a range of them.
+    """
+    # Each record replaces the messages from its start on with its own.
+    length = 0
+    for _, record, _ in records:
+        message_start, count, _ = record["messages"]
+        length = message_start + count
+
+    def read(first: int, last: int) -> List[Message]:
+        rows: List[List[Any]] = []
+        upper = last
+        for _, record, messages in reversed(records):
+            message_start, count, chunk_lengths = record["messages"]
+            if message_start >= upper:
+                continue # Replaced by later records.
+            lower = max(first, message_start)
+            chunk_rows: List[List[Any]] = []
+            offset = 0
+            for i, chunk_length in enumerate(chunk_lengths):
+                chunk_first = message_start + i * MESSAGE_CHUNK
+                if chunk_first < upper and chunk_first + MESSAGE_CHUNK > lower:
+                    chunk = json.loads(zlib.decompress(messages[offset:offset + chunk_length]))
+                    chunk_rows += chunk[max(0, lower - chunk_first):upper - chunk_first]
+                offset += chunk_length
+            rows[:0] = chunk_rows
+            upper = lower
+            if upper <= first:
+                break
+        return save_format.message_log_from_rows(rows).messages
+
+    return length, read
+
+
+def load_checkpoint(filename: str) -> Engine:
+    """
+    Load a game from a checkpoint file, replaying its deltas onto the last full snapshot.
+
+    The map arrays are memory mapped copy on write, so they are read from the file as they are used
+    and changing them never changes the file. Only the last `MESSAGE_TAIL` messages are decoded,
+    and older ones when the message log's `messages` are first looked at. Everything still read
+    from the file is copied into memory by `release_file` before the file is next replaced.
+    """
+    from engine import Engine
+
+    mappings: List[mmap.mmap] = []
+
+    def map_records() -> Tuple[List[Tuple[bytes, Dict[str, Any], memoryview]], int]:
+        with open(filename, "rb") as f:
+            mappings.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        data = memoryview(mappings[-1])
+        records, end = _read_records(data)
+        full_records = [i for i, (kind, _, _) in enumerate(records) if kind == FULL]
+        if not full_records:
+            raise ValueError("Corrupt checkpoint: the file ends before its first full snapshot.")
+        return records[full_records[-1]:], end
+
+    records, end = map_records()
+    root, states, arrays = _replay(records)
+
+    message_count, read_messages = _message_reader(records)
+    tail_start = max(0, message_count - MESSAGE_TAIL)
+    message_log = MessageLog()
+    message_log._messages = read_messages(tail_start, message_count)
+    message_log.older_count = tail_start
+    if tail_start:
+        message_log.load_older = lambda: read_messages(0, tail_start)
+
+    # Create every unit empty first, so references between them can be resolved in any order.
+    units: Dict[int, Any] = {}
+    for unit_id, (module, qualname, _) in states.items():
+        cls = getattr(importlib.import_module(module), qualname)
+        units[unit_id] = cls.__new__(cls)
+    engine = Engine.__new__(Engine)
+
+    def unpickle(data: bytes) -> Any:
+        return _UnitUnpickler(io.BytesIO(data), units, engine, message_log).load()
+
+    for unit_id, (_, _, data) in states.items():
+        state = unpickle(data)
+        for (array_unit_id, name), array in arrays.items():
+            if array_unit_id == unit_id:
+                state[name] = array
+        for name, value in state.items():
+            setattr(units[unit_id], name, value)
+    engine.__dict__.update(unpickle(root))
+
+    # Later checkpoints of this game can carry on appending to the same file. What was saved is
+    # compared against a second mapping of the file, which the game's changes do not reach.
+    writer = CheckpointWriter(filename, engine)
+    writer._units = units
+    writer._unit_ids = {id(unit): unit_id for unit_id, unit in units.items()}
+    writer._next_unit_id = max(units, default=-1) + 1
+    writer._saved_states = {unit_id: _digest(state[2]) for unit_id, state in states.items()}
+    writer._saved_arrays = _replay(map_records()[0])[2]
+    writer._saved_tile_versions = {
+        unit_id: unit.tiles_version for unit_id, unit in units.items() if isinstance(unit, GameMap)
+    }
+    writer._saved_messages = message_count
+    writer._saved_floor = engine.game_world.current_floor
+    writer._deltas = len(records) - 1
+    # Where the last complete record ends. If a crash cut a record short after it, the file is
+    # longer than this, so the next checkpoint is a full one instead of a delta appended after the
+    # broken record.
+    writer._file_size = end
+    writer._mappings = mappings
+    _writers[filename] = writer
+
+    return engine
@@ -4,8 +4,8 @@ from typing import Optional, TYPE_CHECKING
 
 import actions
 from actions import Action
+from area_effects import resolve_area_damage
 import color
-import components.ai
 import components.inventory
 from components.base_component import BaseComponent
 from entity import Actor
@@ -15,6 +15,7 @@ from input_handlers import (
     AreaRangedAttackHandler,
     SingleRangedAttackHandler
 )
+from status_effect_types import StatusEffectType
 
 if TYPE_CHECKING:
     from entity import Actor, Item
@@ -22,10 +23,12 @@ if TYPE_CHECKING:
 
 class Ability(BaseComponent):
     parent: Item
+    __slots__ = ("cooldown_turns", "ready_turn")
 
     def __init__(self, cooldown_turns: int):
         self.cooldown_turns = cooldown_turns
-        self.current_cooldown = 0
+        # The engine turn from which this ability can be used again.
+        self.ready_turn = 0
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
         return actions.ItemAction(consumer, self.parent)
@@ -33,13 +36,22 @@ class Ability(BaseComponent):
     def activate(self, action: actions.ItemAction) -> None:
         raise NotImplementedError()
     
-    def cooldown(self) -> None:
-        """Reduce cooldown by 1 turn."""
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
+    @property
+    def current_cooldown(self) -> int:
+        """The number of turns left until this ability can be used again."""
+        return max(0, self.ready_turn - self.engine.turn)
+
+    def start_cooldown(self) -> None:
+        """Put this ability on cooldown, counting from the current turn."""
+        if self.cooldown_turns <= 0:
+            return
+        self.ready_turn = self.engine.turn + self.cooldown_turns
+        self.engine.schedule_cooldown(self.parent, self.ready_turn)
 
 
 class ConfusionAbility(Ability):
+    __slots__ = ("number_of_turns",)
+
     def __init__(self, number_of_turns: int, cooldown_turns: int):
         super().__init__(cooldown_turns)
         self.number_of_turns = number_of_turns
@@ -71,22 +83,13 @@ class ConfusionAbility(Ability):
             f"The eyes of the {consumer.name} look vacant, as it starts to stumble around!",
             color.status_effect_applied,
         )
-        target.ai = components.ai.ConfusedEnemy(
-            entity=target, previous_ai=target.ai, turns_remaining=self.number_of_turns
-        )
-        self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+        target.status_effects.apply(StatusEffectType.CONFUSION, self.number_of_turns)
+        self.start_cooldown()
 
 
 class HealingAbility(Ability):
+    __slots__ = ("amount",)
+
     def __init__(self, amount: int, cooldown_turns: int):
         super().__init__(cooldown_turns)
         self.amount = amount
@@ -103,21 +106,14 @@ class HealingAbility(Ability):
                 f"You drink from the {self.parent.name}, and recover {amount_recovered} HP!",
                 color.health_recovered,
             )
-            self.current_cooldown = self.cooldown_turns
+            self.start_cooldown()
         else:
             raise Impossible("Your health is already full.")
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
 
 
 class FireballDamageAbility(Ability):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int, cooldown_turns: int):
         super().__init__(cooldown_turns)
         self.damage = damage
@@ -142,30 +138,23 @@ class FireballDamageAbility(Ability):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see.")
         
-        target_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage!",
-                    color.player_atk
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        targets_hit = resolve_area_damage(
+            self.engine,
+            target_xy,
+            self.radius,
+            self.damage,
+            "A fiery explosion engulfs {targets}, dealing {damage} damage!",
+            color.player_atk,
+        )
         
-        if not target_hit:
+        if not targets_hit:
             raise Impossible("There are no targets in the radius.")
-        self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+        self.start_cooldown()
+
 
 class Blackhole(FireballDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, radius: int, cooldown_turns: int):
         super().__init__(damage, radius, cooldown_turns)
     
@@ -178,30 +167,23 @@ class Blackhole(FireballDamageAbility):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see.")
         
-        target_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The {actor.name} is compressed to nothingness!",
-                    color.player_atk
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        targets_hit = resolve_area_damage(
+            self.engine,
+            target_xy,
+            self.radius,
+            self.damage,
+            "The void compresses {targets} to nothingness!",
+            color.player_atk,
+        )
         
-        if not target_hit:
+        if not targets_hit:
             raise Impossible("There are no targets in the radius.")
-        self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+        self.start_cooldown()
+
 
 class StarRage(FireballDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, radius: int, cooldown_turns: int):
         super().__init__(damage, radius, cooldown_turns)
     
@@ -214,31 +196,23 @@ class StarRage(FireballDamageAbility):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see.")
         
-        target_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The stars rain on {actor.name}, dealing {self.damage} damage!",
-                    color.player_atk
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        targets_hit = resolve_area_damage(
+            self.engine,
+            target_xy,
+            self.radius,
+            self.damage,
+            "The stars rain on {targets}, dealing {damage} damage!",
+            color.player_atk,
+        )
         
-        if not target_hit:
+        if not targets_hit:
             raise Impossible("There are no targets in the radius.")
-        self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+        self.start_cooldown()
 
 
 class LightningDamageAbility(Ability):
+    __slots__ = ("damage", "maximum_range")
+
     def __init__(self, damage: int, maximum_range: int, cooldown_turns: int):
         super().__init__(cooldown_turns)
         self.damage = damage
@@ -249,34 +223,22 @@ class LightningDamageAbility(Ability):
             raise Impossible(f"{self.parent.name} is still cooling down.")
         
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
         if target:
             self.engine.message_log.add_message(
                 f"Azure converges on {target.name}, compressing for {self.damage} damage!",
                 color.player_atk
             )
             target.fighter.take_damage(self.damage)
-            self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+            self.start_cooldown()
+
 
 class Shuriken(LightningDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, maximum_range: int, cooldown_turns: int):
         super().__init__(damage, maximum_range, cooldown_turns)
     
@@ -285,34 +247,22 @@ class Shuriken(LightningDamageAbility):
             raise Impossible(f"{self.parent.name} is still cooling down.")
         
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
         if target:
             self.engine.message_log.add_message(
                 f"{target.name} is hit by a shuriken for {self.damage} damage!",
                 color.player_atk
             )
             target.fighter.take_damage(self.damage)
-            self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+            self.start_cooldown()
+
 
 class Kunai(LightningDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, maximum_range: int, cooldown_turns: int):
         super().__init__(damage, maximum_range, cooldown_turns)
     
@@ -321,34 +271,22 @@ class Kunai(LightningDamageAbility):
             raise Impossible(f"{self.parent.name} is still cooling down.")
         
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
         if target:
             self.engine.message_log.add_message(
                 f"{target.name} is hit by a kunai for {self.damage} damage!",
                 color.player_atk
             )
             target.fighter.take_damage(self.damage)
-            self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+            self.start_cooldown()
+
 
 class Bow(LightningDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, maximum_range: int, cooldown_turns: int):
         super().__init__(damage, maximum_range, cooldown_turns)
     
@@ -357,34 +295,22 @@ class Bow(LightningDamageAbility):
             raise Impossible(f"{self.parent.name} is still cooling down.")
         
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
         if target:
             self.engine.message_log.add_message(
                 f"{target.name} is hit by an arrow for {self.damage} damage!",
                 color.player_atk
             )
             target.fighter.take_damage(self.damage)
-            self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
+            self.start_cooldown()
+
 
 class SolarFlare(LightningDamageAbility):
+    __slots__ = ()
+
     def __init__(self, damage: int, maximum_range: int, cooldown_turns: int):
         super().__init__(damage, maximum_range, cooldown_turns)
     
@@ -393,29 +319,14 @@ class SolarFlare(LightningDamageAbility):
             raise Impossible(f"{self.parent.name} is still cooling down.")
         
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
         if target:
             self.engine.message_log.add_message(
                 f"Ruby diverges on {target.name}, bursting for {self.damage} damage!",
                 color.player_atk
             )
             target.fighter.take_damage(self.damage)
-            self.current_cooldown = self.cooldown_turns
-    
-    def cooldown(self) -> None:
-        if self.current_cooldown > 0:
-            self.current_cooldown -= 1
-            if self.current_cooldown == 0:
-                self.engine.message_log.add_message(
-                    f"{self.parent.name} is ready to use again.",
-                    color.status_effect_applied
-                )
\ No newline at end of file
+            self.start_cooldown()
@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import random
-from typing import List, Optional, Tuple, TYPE_CHECKING
-
-import numpy as np # type: ignore
-import tcod
+from typing import List, Tuple, TYPE_CHECKING
 
 from actions import Action, BumpAction, MeleeAction, MovementAction, WaitAction
+from status_effect_types import StatusEffectType
 
 if TYPE_CHECKING:
     from entity import Actor
@@ -17,77 +14,38 @@ class BaseAI(Action):
 
     def perform(self) -> None:
         raise NotImplementedError()
-    
-    def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
-        """Compute and return a path to the target position.
-
-        If there is no valid path then returns an empty list.
-        """
-        # Copy the walkable array.
-        cost = np.array(self.entity.gamemap.tiles["walkable"], dtype=np.int8)
-
-        for entity in self.entity.gamemap.entities:
-            # Check that an entity blocks movement and the cost isn't zero (blocking.)
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                # Add to the cost of a blocked position.
-                # A lower number means more enemies will crowd behind each other in hallways.
-                # A higher number means enemies will take longer paths in order to surround the player.
-                cost[entity.x, entity.y] += 10
-
-        # Create a graph from the cost array and pass that graph to a new pathfinder.
-        graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
-        pathfinder = tcod.path.Pathfinder(graph)
-
-        pathfinder.add_root((self.entity.x, self.entity.y)) # Start position.
-
-        # Compute the path to the destination and remove the starting point.
-        path: List[List[int]] = pathfinder.path_to((dest_x, dest_y))[1:].tolist()
-
-        # Convert from List[List[int]] to List[Tuple[int, int]].
-        return [(index[0], index[1]) for index in path]
 
+    def take_turn(self) -> None:
+        """Act for one turn, unless a status effect gets in the way."""
+        status_effects = self.entity.status_effects
+        if status_effects.has(StatusEffectType.STUN):
+            return WaitAction(self.entity).perform()
+        if status_effects.has(StatusEffectType.CONFUSION):
+            return self.stumble()
+        return self.perform()
 
-class ConfusedEnemy(BaseAI):
-    """
-    A confused enemy will stumble around aimlessly for a given number of turns, then revert back to its previous AI.
-    If an actor occupies a tile it is randomly moving into, it will attack.
-    """
-
-    def __init__(
-        self, entity: Actor, previous_ai: Optional[BaseAI], turns_remaining: int,
-    ):
-        super().__init__(entity)
-
-        self.previous_ai = previous_ai
-        self.turns_remaining = turns_remaining
-
-    def perform(self) -> None:
-        # Revert the AI back to the original state if the effect has run its course.
-        if self.turns_remaining <= 0:
-            self.engine.message_log.add_message(
-                f"The {self.entity.name} is no longer confused."
-            )
-            self.entity.ai = self.previous_ai
-        else: 
-            # Choose a random direction.
-            direction_x, direction_y = random.choice(
-                [
-                    (-1, -1), # Northwest
-                    (0, -1), # North
-                    (1, -1), # Northeast
-                    (-1, 0), # West
-                    (1, 0), # East
-                    (-1, 1), # Southwest
-                    (0, 1), # South
-                    (1, 1), # Southeast
-                ]
-            )
-
-            self.turns_remaining -= 1
-
-            # The actor will either try to move or attack in the chosen random direction.
-            # Its possible the actor will just bump into the wall, wasting a turn.
-            return BumpAction(self.entity, direction_x, direction_y).perform()
+    def stumble(self) -> None:
+        """
+        Stumble in a random direction.
+        If an actor occupies the tile being moved into, it will be attacked.
+        """
+        # Choose a random direction.
+        direction_x, direction_y = self.engine.game_world.rng("ai").choice(
+            [
+                (-1, -1), # Northwest
+                (0, -1), # North
+                (1, -1), # Northeast
+                (-1, 0), # West
+                (1, 0), # East
+                (-1, 1), # Southwest
+                (0, 1), # South
+                (1, 1), # Southeast
+            ]
+        )
+
+        # The actor will either try to move or attack in the chosen random direction.
+        # Its possible the actor will just bump into the wall, wasting a turn.
+        return BumpAction(self.entity, direction_x, direction_y).perform()
 
 
 class HostileEnemy(BaseAI):
@@ -105,7 +63,7 @@ class HostileEnemy(BaseAI):
             if distance <= 1:
                 return MeleeAction(self.entity, dx, dy).perform()
             
-            self.path = self.get_path_to(target.x, target.y)
+            self.path = self.engine.game_map.get_path_to_player(self.entity.x, self.entity.y)
         
         if self.path:
             dest_x, dest_y = self.path.pop(0)
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 
 class BaseComponent:
     parent: Entity # Owning entity instance.
+    __slots__ = ("parent",)
 
     @property
     def gamemap(self) -> GameMap:
@@ -4,8 +4,8 @@ from typing import Optional, TYPE_CHECKING
 
 import actions
 from actions import Action
+from area_effects import resolve_area_damage
 import color
-import components.ai
 import components.inventory
 from components.base_component import BaseComponent
 from entity import Actor
@@ -15,6 +15,7 @@ from input_handlers import (
     AreaRangedAttackHandler,
     SingleRangedAttackHandler
 )
+from status_effect_types import StatusEffectType
 
 if TYPE_CHECKING:
     from entity import Actor, Item
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
 
 class Consumable(BaseComponent):
     parent: Item
+    __slots__ = ()
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
         """Try to return the action for this item.
@@ -48,6 +50,8 @@ class Consumable(BaseComponent):
 
 
 class ConfusionConsumable(Consumable):
+    __slots__ = ("number_of_turns",)
+
     def __init__(self, number_of_turns: int):
         self.number_of_turns = number_of_turns
 
@@ -75,13 +79,13 @@ class ConfusionConsumable(Consumable):
             f"The eyes of the {consumer.name} look vacant, as it starts to stumble around!",
             color.status_effect_applied,
         )
-        target.ai = components.ai.ConfusedEnemy(
-            entity=target, previous_ai=target.ai, turns_remaining=self.number_of_turns
-        )
+        target.status_effects.apply(StatusEffectType.CONFUSION, self.number_of_turns)
         self.consume()
 
 
 class HealingConsumable(Consumable):
+    __slots__ = ("amount",)
+
     def __init__(self, amount: int):
         self.amount = amount
     
@@ -100,6 +104,8 @@ class HealingConsumable(Consumable):
 
 
 class FireballDamageConsumable(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -120,37 +126,31 @@ class FireballDamageConsumable(Consumable):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see.")
         
-        target_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage!"
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        targets_hit = resolve_area_damage(
+            self.engine,
+            target_xy,
+            self.radius,
+            self.damage,
+            "A fiery explosion engulfs {targets}, dealing {damage} damage!",
+        )
         
-        if not target_hit:
+        if not targets_hit:
             raise Impossible("There are no targets in the radius.")
         self.consume()
 
 
 class LightningDamageConsumable(Consumable):
+    __slots__ = ("damage", "maximum_range")
+
     def __init__(self, damage: int, maximum_range: int):
         self.damage = damage
         self.maximum_range = maximum_range
     
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
-
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer
+        )
 
         if target:
             self.engine.message_log.add_message(
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 class Equipment(BaseComponent):
     parent: Actor
+    __slots__ = ("weapon", "armor", "shield", "accessory")
 
     def __init__(
         self,
@@ -17,6 +17,7 @@ class HandType(Enum):
 
 class Equippable(BaseComponent):
     parent: Item
+    __slots__ = ("equipment_type", "hand_type", "power_bonus", "defense_bonus")
 
     def __init__(
         self,
@@ -33,6 +34,8 @@ class Equippable(BaseComponent):
 
 # Weapons
 class Fists(Equippable):
+    __slots__ = ()
+
     def __init__(
             self,
             hand_type: HandType = HandType.TWO_HANDED,
@@ -47,6 +50,8 @@ class Fists(Equippable):
         )
 
 class Dagger(Equippable):
+    __slots__ = ()
+
     def __init__(
             self,
             hand_type: HandType = HandType.ONE_HANDED,
@@ -61,6 +66,8 @@ class Dagger(Equippable):
         )
 
 class Sword(Equippable):
+    __slots__ = ()
+
     def __init__(
             self,
             hand_type: HandType = HandType.ONE_HANDED,
@@ -75,6 +82,8 @@ class Sword(Equippable):
         )
 
 class Staff(Equippable):
+    __slots__ = ()
+
     def __init__(
             self,
             hand_type: HandType = HandType.TWO_HANDED,
@@ -91,6 +100,8 @@ class Staff(Equippable):
 
 # Shields
 class Shield(Equippable):
+    __slots__ = ()
+
     def __init__(
             self,
             hand_type: HandType = HandType.ONE_HANDED,
@@ -105,6 +116,8 @@ class Shield(Equippable):
 
 # Armor
 class Armor(Equippable):
+    __slots__ = ()
+
     def __init__(self, defense_bonus: int = 1):
         super().__init__(equipment_type=EquipmentType.ARMOR, defense_bonus=defense_bonus)
 
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 class Fighter(BaseComponent):
     parent: Actor
+    __slots__ = ("max_hp", "_hp", "base_defense", "base_power")
 
     def __init__(self, hp: int, base_defense: int, base_power: int):
         self.max_hp = hp
@@ -27,6 +28,8 @@ class Fighter(BaseComponent):
         self._hp = max(0, min(value, self.max_hp))
         if self._hp == 0 and self.parent.ai:
             self.die()
+        else:
+            self.gamemap.update_entity(self.parent)
 
     @property
     def defense(self) -> int:
@@ -50,7 +53,13 @@ class Fighter(BaseComponent):
         else:
             return 0
 
-    def die(self) -> None:
+    def die(self, add_message: bool = True) -> None:
+        """
+        Turn this actor into a corpse.
+
+        If `add_message` is False then the death is not announced and no XP is granted, so that
+        the caller can report several deaths and grant their XP at once.
+        """
         if self.engine.player is self.parent:
             death_message = "You died!"
             death_message_color = color.player_die
@@ -64,10 +73,12 @@ class Fighter(BaseComponent):
         self.parent.ai = None
         self.parent.name = f"remains of {self.parent.name}"
         self.parent.render_order = RenderOrder.CORPSE
+        self.gamemap.update_entity(self.parent)
         
-        self.engine.message_log.add_message(death_message, death_message_color)
+        if add_message:
+            self.engine.message_log.add_message(death_message, death_message_color)
 
-        self.engine.player.level.add_xp(self.parent.level.xp_given)
+            self.engine.player.level.add_xp(self.parent.level.xp_given)
 
     def heal(self, amount: int) -> int:
         if self.hp == self.max_hp:
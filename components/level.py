@@ -10,6 +10,13 @@ if TYPE_CHECKING:
 
 class Level(BaseComponent):
     parent: Actor
+    __slots__ = (
+        "current_level",
+        "current_xp",
+        "level_up_base",
+        "level_up_factor",
+        "xp_given",
+    )
 
     def __init__(
         self,
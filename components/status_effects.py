@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Dict, TYPE_CHECKING
+
+from components.base_component import BaseComponent
+from status_effect_types import StatusEffectType
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+# Effects which hurt the actor at the end of every turn they are active.
+DAMAGE_OVER_TIME = (StatusEffectType.POISON, StatusEffectType.BURNING)
+
+EFFECT_ADJECTIVES = {
+    StatusEffectType.CONFUSION: "confused",
+    StatusEffectType.STUN: "stunned",
+    StatusEffectType.POISON: "poisoned",
+    StatusEffectType.BURNING: "burning",
+    StatusEffectType.HASTE: "hasted",
+}
+
+
+class StatusEffect:
+    """A single timed effect, active from `start_turn` until the engine reaches `end_turn`."""
+
+    __slots__ = ("effect_type", "start_turn", "end_turn", "magnitude")
+
+    def __init__(self, effect_type: StatusEffectType, start_turn: int, end_turn: int, magnitude: int):
+        self.effect_type = effect_type
+        self.start_turn = start_turn
+        self.end_turn = end_turn
+        self.magnitude = magnitude
+
+
+class StatusEffects(BaseComponent):
+    """
+    The timed effects currently on an actor.
+
+    Each effect is registered with the engine when applied, and the engine calls `expire` once its
+    end turn comes around, so nothing needs to count down from turn to turn.
+    """
+
+    parent: Actor
+    __slots__ = ("active",)
+
+    def __init__(self) -> None:
+        self.active: Dict[StatusEffectType, StatusEffect] = {}
+
+    def has(self, effect_type: StatusEffectType) -> bool:
+        return effect_type in self.active
+
+    @property
+    def speed_multiplier(self) -> int:
+        return 2 if StatusEffectType.HASTE in self.active else 1
+
+    def apply(self, effect_type: StatusEffectType, turns: int, magnitude: int = 1) -> None:
+        """
+        Apply an effect for a number of turns.
+
+        Applying an effect which is already active stacks onto it: it lasts until the later of the
+        two end turns, with the stronger of the two magnitudes.
+        """
+        engine = self.engine
+        end_turn = engine.turn + turns
+
+        effect = self.active.get(effect_type)
+        if effect:
+            if end_turn <= effect.end_turn and magnitude <= effect.magnitude:
+                return
+            effect.end_turn = max(effect.end_turn, end_turn)
+            effect.magnitude = max(effect.magnitude, magnitude)
+        else:
+            effect = self.active[effect_type] = StatusEffect(
+                effect_type, engine.turn, end_turn, magnitude
+            )
+
+        engine.schedule_effect_expiry(self.parent, effect_type, effect.end_turn)
+        if effect_type in DAMAGE_OVER_TIME:
+            engine.afflicted.add(self.parent)
+
+    def resume(self) -> None:
+        """
+        Track this actor's effects again after the player returns to its floor, removing any which
+        ran out while they were away.
+        """
+        engine = self.engine
+        for effect_type, effect in list(self.active.items()):
+            if effect.end_turn <= engine.turn:
+                del self.active[effect_type]
+                continue
+            engine.schedule_effect_expiry(self.parent, effect_type, effect.end_turn)
+            if effect_type in DAMAGE_OVER_TIME:
+                engine.afflicted.add(self.parent)
+
+    def expire(self, effect_type: StatusEffectType, end_turn: int) -> None:
+        """
+        Remove an effect whose end turn has come.
+
+        Does nothing if the effect was extended since, as a later expiry will be scheduled for it.
+        """
+        effect = self.active.get(effect_type)
+        if effect is None or effect.end_turn != end_turn:
+            return
+        del self.active[effect_type]
+
+        if not self.parent.is_alive:
+            return
+        adjective = EFFECT_ADJECTIVES[effect_type]
+        if self.parent is self.engine.player:
+            self.engine.message_log.add_message(f"You are no longer {adjective}.")
+        else:
+            self.engine.message_log.add_message(f"The {self.parent.name} is no longer {adjective}.")
+
+    def take_damage_over_time(self) -> bool:
+        """
+        Apply one turn of damage from poison and burning.
+
+        Returns True if any damage over time effect is still active.
+        """
+        afflicted = False
+        for effect_type in DAMAGE_OVER_TIME:
+            effect = self.active.get(effect_type)
+            if effect is None:
+                continue
+            afflicted = True
+            self.engine.message_log.add_message(
+                f"{self.parent.name} takes {effect.magnitude} damage from being "
+                f"{EFFECT_ADJECTIVES[effect_type]}."
+            )
+            self.parent.fighter.take_damage(effect.magnitude)
+            if not self.parent.is_alive:
+                return False
+        return afflicted
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import lzma
-import pickle
-from typing import TYPE_CHECKING
+import heapq
+from typing import List, Optional, Set, Tuple, TYPE_CHECKING
 
 from tcod.console import Console
-from tcod.map import compute_fov
 
+from autosave import Autosaver
+from camera import Camera
+import checkpoint
+import color
 import exceptions
 from message_log import MessageLog
 import render_functions
+import save_format
+from status_effect_types import StatusEffectType
+from turn_scheduler import TurnScheduler
 
 if TYPE_CHECKING:
     from entity import Actor, Item
@@ -23,28 +28,155 @@ class Engine:
     def __init__(self, player: Actor):
         self.message_log = MessageLog()
         self.mouse_location = (0, 0)
+        # The part of the map shown on screen, above the UI at the bottom of the console.
+        self.camera = Camera(width=80, height=43)
         self.player = player
+        self.scheduler = TurnScheduler()
+        # The number of turns the player has taken. Cooldowns are measured against this.
+        self.turn = 0
+        # (ready turn, counter, item) for each ability still cooling down.
+        self._cooldowns: List[Tuple[int, int, Item]] = []
+        self._cooldown_counter = 0
+        # (end turn, counter, actor, effect type) for each status effect still active.
+        self._effect_expiries: List[Tuple[int, int, Actor, StatusEffectType]] = []
+        self._effect_counter = 0
+        # Actors with a damage over time effect, such as poison.
+        self.afflicted: Set[Actor] = set()
+        # How often update_fov had to compute the FOV, and how often it could be skipped.
+        self.fov_recomputes = 0
+        self.fov_skips = 0
+        self.autosaver: Optional[Autosaver] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # The autosaver owns a thread, and is started again by whoever loads the game.
+        state["autosaver"] = None
+        return state
+
+    def schedule_floor(self) -> None:
+        """
+        Schedule the actors of the current floor, in a deterministic order.
+
+        Status effects of actors on a floor returned to are resumed, as they stopped being tracked
+        when the player left.
+        """
+        actors = sorted(
+            (actor for actor in self.game_map.actors if actor is not self.player),
+            key=lambda actor: (actor.y, actor.x),
+        )
+        for actor in actors:
+            if actor.status_effects.active:
+                actor.status_effects.resume()
+        self.scheduler.reset(actors)
+
+    def actor_activity(self, actor: Actor) -> int:
+        """
+        Return how many turns this actor waits between actions, or 0 if it should go dormant.
+
+        Actors near the player or in sight act every turn, actors in explored areas a little
+        further out act less often, and everything else sleeps until it is woken up.
+        """
+        game_world = self.game_world
+        distance = max(abs(actor.x - self.player.x), abs(actor.y - self.player.y))
+
+        if distance <= game_world.ai_active_radius or self.game_map.visible[actor.x, actor.y]:
+            return 1
+        if distance <= game_world.ai_dormant_radius and self.game_map.explored[actor.x, actor.y]:
+            return game_world.ai_reduced_tick_interval
+        return 0
+
+    def wake_actors(self, x: int, y: int, radius: int) -> None:
+        """Wake any dormant actors within `radius` of (x, y), such as from noise."""
+        if not self.scheduler.dormant:
+            return
+        for actor in self.game_map.get_actors_in_radius(x, y, radius):
+            self.scheduler.wake(actor)
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
+        # Chasers share one flow field toward the player, computed at most once per turn.
+        self.game_map.invalidate_flow_field()
+
+        # Anything close enough to see or hear the player wakes up.
+        self.wake_actors(self.player.x, self.player.y, self.game_world.ai_active_radius)
+
+        self.scheduler.advance(self.player)
+
+        for entity in self.scheduler.ready_actors(self.actor_activity):
             if entity.ai:
                 try:
-                    entity.ai.perform()
+                    entity.ai.take_turn()
                 except exceptions.Impossible:
                     pass # Ignore impossible action exceptions from AI.
 
+    def schedule_cooldown(self, item: Item, ready_turn: int) -> None:
+        """Announce when an item's ability becomes ready at `ready_turn`."""
+        self._cooldown_counter += 1
+        heapq.heappush(self._cooldowns, (ready_turn, self._cooldown_counter, item))
+
+    def schedule_effect_expiry(
+        self, actor: Actor, effect_type: StatusEffectType, end_turn: int
+    ) -> None:
+        """Expire a status effect on `actor` once `end_turn` is reached."""
+        self._effect_counter += 1
+        heapq.heappush(self._effect_expiries, (end_turn, self._effect_counter, actor, effect_type))
+
+    def forget_floor(self, game_map: GameMap) -> None:
+        """
+        Drop the status effect expiries and cooldowns of everything on a floor moved out of memory,
+        so they do not keep it alive. Effects are resumed if the player returns to the floor.
+        """
+        self._effect_expiries = [
+            entry for entry in self._effect_expiries if entry[2].gamemap is not game_map
+        ]
+        heapq.heapify(self._effect_expiries)
+        self._cooldowns = [entry for entry in self._cooldowns if entry[2].gamemap is not game_map]
+        heapq.heapify(self._cooldowns)
+
+    def end_turn(self) -> None:
+        """
+        Advance the turn counter, then apply damage over time, expire status effects and report
+        any of the player's abilities that are ready again.
+
+        Only the effects and cooldowns which run out this turn are looked at, however many are
+        active.
+        """
+        self.turn += 1
+
+        for actor in list(self.afflicted):
+            if actor.gamemap is not self.game_map or not actor.status_effects.take_damage_over_time():
+                self.afflicted.discard(actor)
+
+        while self._effect_expiries and self._effect_expiries[0][0] <= self.turn:
+            end_turn, _, actor, effect_type = heapq.heappop(self._effect_expiries)
+            if actor.gamemap is not self.game_map:
+                continue # Left behind on another floor, and resumed if the player returns.
+            actor.status_effects.expire(effect_type, end_turn)
+
+        while self._cooldowns and self._cooldowns[0][0] <= self.turn:
+            ready_turn, _, item = heapq.heappop(self._cooldowns)
+            if item.ability.ready_turn != ready_turn:
+                continue # The ability was used again since, so a later entry covers it.
+            if item in self.player.inventory.items:
+                self.message_log.add_message(
+                    f"{item.name} is ready to use again.", color.status_effect_applied
+                )
+
     def update_fov(self) -> None:
         """Recompute the visible area based on the players point of view"""
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"],
-            (self.player.x, self.player.y),
-            radius=8,
-        )
-        # If a tile is visible it should be added to explored
-        self.game_map.explored |= self.game_map.visible
+        if self.game_map.update_fov(self.player.x, self.player.y, radius=8):
+            self.fov_recomputes += 1
+        else:
+            self.fov_skips += 1
+
+    @property
+    def fov_hit_rate(self) -> float:
+        """The fraction of update_fov calls which were skipped because nothing changed."""
+        total = self.fov_recomputes + self.fov_skips
+        return self.fov_skips / total if total else 0.0
 
     def render(self, console: Console) -> None:
-        self.game_map.render(console)
+        self.camera.center_on(self.player.x, self.player.y, self.game_map)
+        self.game_map.render(console, self.camera.view)
 
         self.message_log.render(console=console, x=21, y=45, width=40, height=5)
 
@@ -67,6 +199,21 @@ class Engine:
 
     def save_as(self, filename: str) -> None:
         """Save this Engine instance as a compressed file."""
-        save_data = lzma.compress(pickle.dumps(self))
         with open(filename, "wb") as f:
-            f.write(save_data)
\ No newline at end of file
+            save_format.dump_engine(self, f)
+
+    def checkpoint(self, filename: str) -> int:
+        """
+        Save this Engine instance as a checkpoint, returning the number of bytes written.
+
+        Only the first checkpoint of a floor writes the whole game; later ones append what changed.
+        """
+        if self.autosaver:
+            self.autosaver.flush()
+        return checkpoint.save_checkpoint(self, filename)
+
+    def enable_autosave(self, filename: str, interval: int = 20) -> None:
+        """Checkpoint this game to `filename` every `interval` turns, in the background."""
+        if self.autosaver:
+            self.autosaver.close()
+        self.autosaver = Autosaver(self, filename, interval)
\ No newline at end of file
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import copy
 import math
-from typing import Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
+from typing import Callable, Dict, Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
 
+from components.status_effects import StatusEffects
 from render_order import RenderOrder
 
 if TYPE_CHECKING:
@@ -19,6 +20,16 @@ if TYPE_CHECKING:
 
 T = TypeVar("T", bound="Entity")
 
+# The recipe each prototype entity was built from, so copies can be built the same way.
+prototype_recipes: Dict[Entity, Callable[[], Entity]] = {}
+
+
+def register_prototype(recipe: Callable[[], T]) -> T:
+    """Build a prototype entity from `recipe`, and remember the recipe for making copies of it."""
+    prototype = recipe()
+    prototype_recipes[prototype] = recipe
+    return prototype
+
 
 class Entity:
     """
@@ -26,6 +37,16 @@ class Entity:
     """
 
     parent: Union[GameMap, Inventory]
+    __slots__ = (
+        "parent",
+        "x",
+        "y",
+        "char",
+        "color",
+        "name",
+        "blocks_movement",
+        "render_order",
+    )
 
     def __init__(
         self,
@@ -48,31 +69,50 @@ class Entity:
         if parent:
             # If parent isn't provided now then it will be set later.
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def gamemap(self) -> GameMap:
         return self.parent.gamemap
 
+    def clone(self: T) -> T:
+        """
+        Return a fresh copy of this entity.
+
+        Registered prototypes are rebuilt from their recipe, which gives the same result as a deep
+        copy but only calls the constructors. Anything else falls back to a deep copy.
+        """
+        recipe = prototype_recipes.get(self)
+        if recipe is None:
+            return copy.deepcopy(self)
+        return recipe() # type: ignore
+
     def spawn(self: T, gamemap: GameMap, x: int, y: int) -> T:
         """Spawn a copy of this entity at the given location"""
-        clone = copy.deepcopy(self)
+        clone = self.clone()
         clone.x = x
         clone.y = y
         clone.parent = gamemap
-        gamemap.entities.add(clone)
+        gamemap.add_entity(clone)
         return clone
     
     def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
         """Place this entity at a new location. Handles moving across GameMaps."""
-        self.x = x
-        self.y = y
         if gamemap:
             if hasattr(self, "parent"): # Possibly uninitialized.
                 if self.parent is self.gamemap:
-                    self.gamemap.entities.remove(self)
+                    self.gamemap.remove_entity(self)
+            if self in gamemap.entities: # Already indexed at its old position.
+                gamemap.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = gamemap
-            gamemap.entities.add(self)
+            gamemap.add_entity(self)
+        elif hasattr(self, "parent") and self.parent is self.gamemap:
+            self.gamemap.move_entity(self, x, y)
+        else:
+            self.x = x
+            self.y = y
 
     def distance(self, x: int, y: int) -> float:
         """
@@ -82,11 +122,12 @@ class Entity:
 
     def move(self, dx: int, dy: int) -> None:
         # Move the entity by a given amount
-        self.x += dx
-        self.y += dy
+        self.gamemap.move_entity(self, self.x + dx, self.y + dy)
 
 
 class Actor(Entity):
+    __slots__ = ("ai", "equipment", "fighter", "inventory", "level", "speed", "status_effects")
+
     def __init__(
         self,
         *,
@@ -100,6 +141,7 @@ class Actor(Entity):
         fighter: Fighter,
         inventory: Inventory,
         level: Level,
+        speed: int = 100,
     ):
         super().__init__(
             x=x,
@@ -125,6 +167,12 @@ class Actor(Entity):
         self.level = level
         self.level.parent = self
 
+        self.status_effects = StatusEffects()
+        self.status_effects.parent = self
+
+        # How quickly this actor acts, 100 is normal speed and 200 acts twice as often.
+        self.speed = speed
+
     @property
     def is_alive(self) -> bool:
         """Returns True as long as this actor can perform actions."""
@@ -132,6 +180,8 @@ class Actor(Entity):
     
 
 class Item(Entity):
+    __slots__ = ("consumable", "equippable", "ability")
+
     def __init__(
         self,
         *,
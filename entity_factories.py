@@ -5,11 +5,11 @@ from components.fighter import Fighter
 from components.inventory import Inventory
 from components.level import Level
 from components.equippable import HandType
-from entity import Actor, Item
+from entity import Actor, Item, register_prototype
 
 
 # Player
-player = Actor(
+player = register_prototype(lambda: Actor(
     char="@",
     color=(255, 255, 255),
     name="Player",
@@ -18,10 +18,10 @@ player = Actor(
     fighter=Fighter(hp=30, base_defense=2, base_power=5),
     inventory=Inventory(capacity=26),
     level=Level(level_up_base=200),
-)
+))
 
 # Enemies
-ashigaru = Actor(
+ashigaru = register_prototype(lambda: Actor(
     char="a",
     color=(63, 127, 63),
     name="Ashigaru",
@@ -30,8 +30,8 @@ ashigaru = Actor(
     fighter=Fighter(hp=10, base_defense=0, base_power=3),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=35),
-)
-ninja = Actor(
+))
+ninja = register_prototype(lambda: Actor(
     char="n",
     color=(0, 127, 0),
     name="Ninja",
@@ -40,8 +40,8 @@ ninja = Actor(
     fighter=Fighter(hp=16, base_defense=1, base_power=4),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=50),
-)
-shinobi = Actor(
+))
+shinobi = register_prototype(lambda: Actor(
     char="s",
     color=(0, 127, 0),
     name="Shinobi",
@@ -50,8 +50,8 @@ shinobi = Actor(
     fighter=Fighter(hp=16, base_defense=1, base_power=4),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=50),
-)
-onna_bugeisha = Actor(
+))
+onna_bugeisha = register_prototype(lambda: Actor(
     char="w",
     color=(0, 127, 0),
     name="Onna-bugeisha",
@@ -60,8 +60,8 @@ onna_bugeisha = Actor(
     fighter=Fighter(hp=25, base_defense=4, base_power=8),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=70),
-)
-samurai = Actor(
+))
+samurai = register_prototype(lambda: Actor(
     char="s",
     color=(0, 127, 0),
     name="Samurai",
@@ -70,8 +70,8 @@ samurai = Actor(
     fighter=Fighter(hp=25, base_defense=4, base_power=8),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=70),
-)
-ronin = Actor(
+))
+ronin = register_prototype(lambda: Actor(
     char="R",
     color=(0, 127, 0),
     name="Ronin",
@@ -80,8 +80,8 @@ ronin = Actor(
     fighter=Fighter(hp=30, base_defense=3, base_power=10),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=100),
-)
-sohei = Actor(
+))
+sohei = register_prototype(lambda: Actor(
     char="S",
     color=(0, 127, 0),
     name="Sohei",
@@ -90,8 +90,8 @@ sohei = Actor(
     fighter=Fighter(hp=25, base_defense=2, base_power=10),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=100),
-)
-bushi = Actor(
+))
+bushi = register_prototype(lambda: Actor(
     char="B",
     color=(0, 127, 0),
     name="Bushi",
@@ -100,37 +100,37 @@ bushi = Actor(
     fighter=Fighter(hp=40, base_defense=4, base_power=15),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=150),
-)
+))
 
 
 # Consumables
-confusion_scroll = Item(
+confusion_scroll = register_prototype(lambda: Item(
     char="~",
     color=(207, 63, 255),
     name="Smoke Screen",
     consumable=consumable.ConfusionConsumable(number_of_turns=10),
-)
-fireball_scroll = Item(
+))
+fireball_scroll = register_prototype(lambda: Item(
     char="~",
     color=(255, 125, 0),
     name="Fire Bomb",
     consumable=consumable.FireballDamageConsumable(damage=12, radius=3),
-)
-health_potion = Item(
+))
+health_potion = register_prototype(lambda: Item(
     char="!",
     color=(0, 255, 175),
     name="Healing Cup",
     consumable=consumable.HealingConsumable(amount=4),
-)
-lightning_scroll = Item(
+))
+lightning_scroll = register_prototype(lambda: Item(
     char="~",
     color=(255, 255, 0),
     name="Shockwave",
     consumable=consumable.LightningDamageConsumable(damage=20, maximum_range=5),
-)
+))
 
 # Weapons
-wrapped_fists = Item(
+wrapped_fists = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Wrapped Fists",
@@ -139,8 +139,8 @@ wrapped_fists = Item(
         power_bonus=1,
         defense_bonus=0,
     ),
-)
-tonfa = Item(
+))
+tonfa = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Tonfa",
@@ -149,8 +149,8 @@ tonfa = Item(
         power_bonus=2,
         defense_bonus=2,
     ),
-)
-nunchucks = Item(
+))
+nunchucks = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Nunchucks",
@@ -159,8 +159,8 @@ nunchucks = Item(
         power_bonus=3,
         defense_bonus=2,
     ),
-)
-shuko = Item(
+))
+shuko = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Shuko",
@@ -169,8 +169,8 @@ shuko = Item(
         power_bonus=4,
         defense_bonus=0,
     ),
-)
-tekko = Item(
+))
+tekko = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Tekko",
@@ -179,8 +179,8 @@ tekko = Item(
         power_bonus=5,
         defense_bonus=0,
     ),
-)
-dagger = Item(
+))
+dagger = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Tanto",
@@ -189,8 +189,8 @@ dagger = Item(
         power_bonus=2,
         defense_bonus=0,
     ),
-)
-wakizashi = Item(
+))
+wakizashi = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Wakizashi",
@@ -199,8 +199,8 @@ wakizashi = Item(
         power_bonus=3,
         defense_bonus=0,
     ),
-)
-katana = Item(
+))
+katana = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Katana",
@@ -209,8 +209,8 @@ katana = Item(
         power_bonus=4,
         defense_bonus=1,
     ),
-)
-nagamaki = Item(
+))
+nagamaki = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Nagamaki",
@@ -219,8 +219,8 @@ nagamaki = Item(
         power_bonus=5,
         defense_bonus=1,
     ),
-)
-naginata = Item(
+))
+naginata = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Naginata",
@@ -229,8 +229,8 @@ naginata = Item(
         power_bonus=6,
         defense_bonus=2,
     ),
-)
-bo = Item(
+))
+bo = register_prototype(lambda: Item(
     char="/",
     color=(0, 191, 255),
     name="Bo",
@@ -239,11 +239,11 @@ bo = Item(
         power_bonus=4,
         defense_bonus=3,
     ),
-)
+))
 
 
 # Shields
-buckler = Item(
+buckler = register_prototype(lambda: Item(
     char=")",
     color=(139, 69, 19),
     name="Buckler",
@@ -251,8 +251,8 @@ buckler = Item(
         hand_type=HandType.ONE_HANDED,
         defense_bonus=1,
     ),
-)
-targe = Item(
+))
+targe = register_prototype(lambda: Item(
     char=")",
     color=(139, 69, 19),
     name="Targe",
@@ -260,8 +260,8 @@ targe = Item(
         hand_type=HandType.ONE_HANDED,
         defense_bonus=2,
     ),
-)
-kite_shield = Item(
+))
+kite_shield = register_prototype(lambda: Item(
     char=")",
     color=(139, 69, 19),
     name="Kite Shield",
@@ -269,8 +269,8 @@ kite_shield = Item(
         hand_type=HandType.ONE_HANDED,
         defense_bonus=3,
     ),
-)
-heater_shield = Item(
+))
+heater_shield = register_prototype(lambda: Item(
     char=")",
     color=(139, 69, 19),
     name="Heater Shield",
@@ -278,8 +278,8 @@ heater_shield = Item(
         hand_type=HandType.ONE_HANDED,
         defense_bonus=4,
     ),
-)
-tower_shield = Item(
+))
+tower_shield = register_prototype(lambda: Item(
     char=")",
     color=(139, 69, 19),
     name="Tower Shield",
@@ -287,121 +287,121 @@ tower_shield = Item(
         hand_type=HandType.TWO_HANDED,
         defense_bonus=5,
     ),
-)
+))
 
 
 # Armor
-cloth_armor = Item(
+cloth_armor = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Cloth Yoroi",
     equippable=equippable.Armor(defense_bonus=1),
-)
-leather_armor = Item(
+))
+leather_armor = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Leather Gusoku",
     equippable=equippable.Armor(defense_bonus=2),
-)
-chain_mail = Item(
+))
+chain_mail = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Plated Gusoku",
     equippable=equippable.Armor(defense_bonus=3),
-)
-lamellar_armor = Item(
+))
+lamellar_armor = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Lamellar Gusoku",
     equippable=equippable.Armor(defense_bonus=4),
-)
-tatami_do = Item(
+))
+tatami_do = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Tatami Gusoku",
     equippable=equippable.Armor(defense_bonus=5),
-)
-o_yoroi = Item(
+))
+o_yoroi = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="O-Yoroi",
     equippable=equippable.Armor(defense_bonus=6),
-)
-oni_mail = Item(
+))
+oni_mail = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Oni Gusoku",
     equippable=equippable.Armor(defense_bonus=8),
-)
-star_forged_mail = Item(
+))
+star_forged_mail = register_prototype(lambda: Item(
     char="[",
     color=(139, 69, 19),
     name="Star-forged Gusoku",
     equippable=equippable.Armor(defense_bonus=10),
-)
+))
 
 
 # Abilities
-confusion_ability = Item(
+confusion_ability = register_prototype(lambda: Item(
     char="*",
     color=(54, 40, 113),
     name="Evoke Blindness",
     ability=ability.ConfusionAbility(number_of_turns=15, cooldown_turns=5),
-)
-fireball_ability = Item(
+))
+fireball_ability = register_prototype(lambda: Item(
     char="*",
     color=(255, 0, 125),
     name="Supernova",
     ability=ability.FireballDamageAbility(damage=25, radius=5, cooldown_turns=5),
-)
-healing_ability = Item(
+))
+healing_ability = register_prototype(lambda: Item(
     char="*",
     color=(0, 255, 0),
     name="Gourd of Vitality",
     ability=ability.HealingAbility(amount=5, cooldown_turns=5),
-)
-lightning_ability = Item(
+))
+lightning_ability = register_prototype(lambda: Item(
     char="*",
     color=(0, 100, 255),
     name="Comet Azure",
     ability=ability.LightningDamageAbility(damage=30, maximum_range=7, cooldown_turns=5),
-)
-shuriken = Item(
+))
+shuriken = register_prototype(lambda: Item(
     char="*",
     color=(160, 160, 160),
     name="Shuriken",
     ability=ability.Shuriken(damage=7, maximum_range=4, cooldown_turns=0),
-)
-kunai = Item(
+))
+kunai = register_prototype(lambda: Item(
     char="*",
     color=(130, 160, 190),
     name="Kunai",
     ability=ability.Kunai(damage=10, maximum_range=4, cooldown_turns=0),
-)
-bow = Item(
+))
+bow = register_prototype(lambda: Item(
     char="*",
     color=(130, 160, 190),
     name="Bow",
     ability=ability.Bow(damage=15, maximum_range=7, cooldown_turns=1),
-)
-black_hole = Item(
+))
+black_hole = register_prototype(lambda: Item(
     char="*",
     color=(0, 0, 0),
     name="Black Hole",
     ability=ability.Blackhole(damage=100, radius=7, cooldown_turns=20),
-)
-solar_flare = Item(
+))
+solar_flare = register_prototype(lambda: Item(
     char="*",
     color=(255, 0, 0),
     name="Ruby Flare",
     ability=ability.SolarFlare(damage=30, maximum_range=7, cooldown_turns=5),
-)
-star_rage = Item(
+))
+star_rage = register_prototype(lambda: Item(
     char="*",
     color=(125, 0, 255),
     name="Star Rage",
     ability=ability.StarRage(damage=20, radius=5, cooldown_turns=5),
-)
+))
 
 
 # Accessories
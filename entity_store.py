@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np # type: ignore
+
+from render_order import RenderOrder
+
+if TYPE_CHECKING:
+    from entity import Actor, Entity
+
+
+class EntityStore:
+    """
+    A struct-of-arrays view of the entities on a GameMap.
+
+    Each entity owns a slot, and its position, render order, glyph, color, alive flag and HP are
+    kept in NumPy columns at that slot. The entity objects stay authoritative; the map pushes
+    their changes here so rendering and area queries can work on whole arrays at once.
+
+    Slots are also bucketed by render order, so drawing can go layer by layer without sorting.
+    """
+
+    def __init__(self, entities: Iterable[Entity] = (), capacity: int = 64):
+        self.entities: List[Optional[Entity]] = [None] * capacity
+        self.slots: Dict[Entity, int] = {}
+        self._free_slots = list(range(capacity - 1, -1, -1))
+
+        self.in_use = np.zeros(capacity, dtype=bool)
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.render_order = np.zeros(capacity, dtype=np.int8)
+        self.char = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+
+        self.layers: Dict[RenderOrder, Set[int]] = {order: set() for order in RenderOrder}
+        self._layer_slots: Dict[RenderOrder, Optional[np.ndarray]] = {
+            order: None for order in RenderOrder
+        }
+
+        for entity in entities:
+            self.add(entity)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.entities)
+
+    def _grow(self) -> None:
+        """Double the capacity of every column."""
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+
+        for name in ("in_use", "x", "y", "render_order", "char", "color", "alive", "hp"):
+            column = getattr(self, name)
+            grown = np.zeros((new_capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:old_capacity] = column
+            setattr(self, name, grown)
+
+        self.entities.extend([None] * old_capacity)
+        self._free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def add(self, entity: Entity) -> None:
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        self.slots[entity] = slot
+        self.entities[slot] = entity
+        self.in_use[slot] = True
+        self._add_to_layer(slot, entity.render_order)
+        self.update(entity)
+
+    def remove(self, entity: Entity) -> None:
+        slot = self.slots.pop(entity)
+        self._remove_from_layer(slot, RenderOrder(self.render_order[slot]))
+        self.entities[slot] = None
+        self.in_use[slot] = False
+        self.alive[slot] = False
+        self._free_slots.append(slot)
+
+    def _add_to_layer(self, slot: int, order: RenderOrder) -> None:
+        self.render_order[slot] = order.value
+        self.layers[order].add(slot)
+        self._layer_slots[order] = None
+
+    def _remove_from_layer(self, slot: int, order: RenderOrder) -> None:
+        self.layers[order].discard(slot)
+        self._layer_slots[order] = None
+
+    def layer_slots(self, order: RenderOrder) -> np.ndarray:
+        """Return the slots in one render order bucket as an array, cached until it changes."""
+        slots = self._layer_slots[order]
+        if slots is None:
+            slots = self._layer_slots[order] = np.fromiter(self.layers[order], dtype=np.intp)
+        return slots
+
+    def move(self, entity: Entity) -> None:
+        """Copy an entity's position into its slot."""
+        slot = self.slots[entity]
+        self.x[slot] = entity.x
+        self.y[slot] = entity.y
+
+    def update(self, entity: Entity) -> None:
+        """Copy every mirrored attribute of an entity into its slot."""
+        slot = self.slots[entity]
+        if self.render_order[slot] != entity.render_order.value:
+            self._remove_from_layer(slot, RenderOrder(self.render_order[slot]))
+            self._add_to_layer(slot, entity.render_order)
+
+        self.x[slot] = entity.x
+        self.y[slot] = entity.y
+        self.render_order[slot] = entity.render_order.value
+        self.char[slot] = ord(entity.char)
+        self.color[slot] = entity.color
+
+        fighter = getattr(entity, "fighter", None)
+        self.alive[slot] = bool(getattr(entity, "ai", None))
+        self.hp[slot] = fighter.hp if fighter else 0
+
+    def visible_layers(
+        self, visible: np.ndarray, window: Tuple[slice, slice]
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield the slots of entities on visible tiles within the window, one render order bucket
+        at a time from the bottom layer to the top.
+        """
+        x_window, y_window = window
+        for order in RenderOrder:
+            slots = self.layer_slots(order)
+            xs, ys = self.x[slots], self.y[slots]
+            in_window = (
+                (xs >= x_window.start) & (xs < x_window.stop)
+                & (ys >= y_window.start) & (ys < y_window.stop)
+            )
+            slots, xs, ys = slots[in_window], xs[in_window], ys[in_window]
+            yield slots[visible[xs, ys]]
+
+    def nearest_actors(
+        self,
+        x: int,
+        y: int,
+        k: int,
+        max_distance: float,
+        visible: Optional[np.ndarray] = None,
+        exclude: Optional[Entity] = None,
+    ) -> List[Actor]:
+        """
+        Return up to `k` living actors closer than `max_distance` to (x, y), nearest first.
+
+        If `visible` is given then only actors standing on visible tiles are considered.
+        """
+        dx = self.x - x
+        dy = self.y - y
+        distance_squared = dx * dx + dy * dy
+        mask = self.alive & (distance_squared < max_distance * max_distance)
+        if visible is not None:
+            mask &= visible[self.x, self.y]
+        if exclude in self.slots:
+            mask[self.slots[exclude]] = False
+
+        slots = np.flatnonzero(mask)
+        slots = slots[np.argsort(distance_squared[slots], kind="stable")[:k]]
+        return [self.entities[slot] for slot in slots]
+
+    def actors_in_radius(self, x: int, y: int, radius: float) -> List[Actor]:
+        """Return the living actors within `radius` of the given (x, y) coordinate."""
+        dx = self.x - x
+        dy = self.y - y
+        mask = self.alive & (dx * dx + dy * dy <= radius * radius)
+        return [self.entities[slot] for slot in np.flatnonzero(mask)]
@@ -0,0 +1,152 @@
+"""
+Keeping the floors the player has left, so they can be returned to by the stairs.
+
+The most recently visited floors stay in memory, as long as they fit in a memory budget. Older
+floors are pickled, compressed and written to a temporary file until they are needed again.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, TYPE_CHECKING
+import weakref
+import zlib
+
+if TYPE_CHECKING:
+    from engine import Engine
+    from game_map import GameMap
+
+# Holds the files of stored floors, and is deleted when the game exits.
+_directory: Optional[tempfile.TemporaryDirectory] = None
+
+
+def _floor_directory() -> str:
+    global _directory
+    if _directory is None:
+        _directory = tempfile.TemporaryDirectory(prefix="roguelike-floors-")
+    return _directory.name
+
+
+def _remove_file(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+class _FloorPickler(pickle.Pickler):
+    """Pickles a floor on its own, leaving out the engine, the player and the message log."""
+
+    def __init__(self, file: BinaryIO, engine: Engine):
+        super().__init__(file, protocol=5)
+        self.engine = engine
+
+    def persistent_id(self, obj: Any) -> Any:
+        if obj is self.engine:
+            return "engine"
+        if obj is self.engine.player:
+            return "player"
+        if obj is self.engine.message_log:
+            return "message_log"
+        return None
+
+
+class _FloorUnpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, engine: Engine):
+        super().__init__(file)
+        self.engine = engine
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "engine":
+            return self.engine
+        if pid == "player":
+            return self.engine.player
+        if pid == "message_log":
+            return self.engine.message_log
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid!r}")
+
+
+class StoredFloor:
+    """A floor moved out of memory, as a compressed pickle in a file."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    @property
+    def data(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    @data.setter
+    def data(self, data: bytes) -> None:
+        handle, self.path = tempfile.mkstemp(suffix=".floor", dir=_floor_directory())
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+        # The file is deleted along with this object, such as when a game is replaced by loading.
+        self._remove = weakref.finalize(self, _remove_file, self.path)
+
+    def discard(self) -> None:
+        """Delete the file, once the floor is back in memory."""
+        self._remove()
+
+    def __getstate__(self) -> dict:
+        # A saved game keeps the floor itself, as the file goes away when the game exits.
+        return {"data": self.data}
+
+    def __setstate__(self, state: dict) -> None:
+        self.data = state["data"]
+
+
+class FloorCache:
+    """
+    The floors the player has left, by floor number.
+
+    Floors in memory are kept in order of when they were left. Whenever they use more than
+    `memory_budget` bytes, the one left longest ago is stored to disk.
+    """
+
+    def __init__(self, engine: Engine, memory_budget: int = 64 * 1024 * 1024):
+        self.engine = engine
+        self.memory_budget = memory_budget
+        self.resident: OrderedDict[int, GameMap] = OrderedDict()
+        self.stored: Dict[int, StoredFloor] = {}
+        # A number for every time a floor was put in memory, by floor. A floor cannot change while
+        # it is here, so this tells whether it is still the same as when it was last looked at.
+        self.put_numbers: Dict[int, int] = {}
+        self._puts = 0
+
+    def __contains__(self, floor: int) -> bool:
+        return floor in self.resident or floor in self.stored
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(game_map.nbytes for game_map in self.resident.values())
+
+    def put(self, floor: int, game_map: GameMap) -> None:
+        """Keep a floor the player is leaving."""
+        self.resident[floor] = game_map
+        self.resident.move_to_end(floor)
+        self._puts += 1
+        self.put_numbers[floor] = self._puts
+        while self.resident and self.resident_bytes > self.memory_budget:
+            old_floor, old_map = self.resident.popitem(last=False)
+            del self.put_numbers[old_floor]
+            self.engine.forget_floor(old_map)
+            data = io.BytesIO()
+            _FloorPickler(data, self.engine).dump(old_map)
+            self.stored[old_floor] = StoredFloor(zlib.compress(data.getvalue(), 1))
+
+    def take(self, floor: int) -> Optional[GameMap]:
+        """Return a floor the player is going back to, or None if it was never left."""
+        game_map = self.resident.pop(floor, None)
+        if game_map is not None:
+            del self.put_numbers[floor]
+            return game_map
+        stored = self.stored.pop(floor, None)
+        if stored is None:
+            return None
+        game_map = _FloorUnpickler(io.BytesIO(zlib.decompress(stored.data)), self.engine).load()
+        stored.discard()
+        return game_map
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+from concurrent.futures import Future, ThreadPoolExecutor
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import numpy as np # type: ignore
+import tcod
 from tcod.console import Console
+from tcod.map import compute_fov
 
 from entity import Actor, Item
+from entity_store import EntityStore
+from spatial_index import SpatialIndex
+from floor_cache import FloorCache
 import tile_types
 
 if TYPE_CHECKING:
@@ -20,6 +28,11 @@ class GameMap:
         self.engine = engine
         self.width, self.height = width, height
         self.entities = set(entities)
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._entity_store: Optional[EntityStore] = None
+        self._path_cost: Optional[np.ndarray] = None
+        self._player_flow_field: Optional[tcod.path.Pathfinder] = None
+        self._flow_field_window: Tuple[slice, slice] = (slice(0, 0), slice(0, 0))
         self.tiles = np.full((width, height), fill_value=tile_types.wall, order="F")
 
         self.visible = np.full(
@@ -30,11 +43,184 @@ class GameMap:
         ) # Tiles the player has seen before
 
         self.downstairs_location = (0, 0)
+        # Where the player arrives on this floor, which has stairs back up below the first floor.
+        self.entry_location = (0, 0)
+        self.upstairs_location = (-1, -1)
+
+        # Bumped whenever `tiles` is edited, so caches derived from it know to rebuild.
+        self.tiles_version = 0
+        # The point of view, tiles version and area of the last FOV computation.
+        self._fov_key: Optional[Tuple[int, int, int]] = None
+        self._fov_window: Tuple[slice, slice] = (slice(0, 0), slice(0, 0))
+
+        # The composited map tiles, and the same with entity glyphs drawn on top, for the part of
+        # the map in `_frame_view`. Only the windows and cells marked dirty since the last frame
+        # are recomposited.
+        self._tile_layer: Optional[np.ndarray] = None
+        self._frame: Optional[np.ndarray] = None
+        self._frame_view: Tuple[slice, slice] = (slice(0, 0), slice(0, 0))
+        self._frame_tiles_version = -1
+        self._dirty_windows: List[Tuple[slice, slice]] = []
+        self._dirty_cells: Set[Tuple[int, int]] = set()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # The spatial index, entity store, path costs and render caches are derived from the tiles
+        # and entities, so they are rebuilt instead of saved.
+        state["_spatial_index"] = None
+        state["_entity_store"] = None
+        state["_path_cost"] = None
+        state["_player_flow_field"] = None
+        state["_tile_layer"] = None
+        state["_frame"] = None
+        state["_dirty_windows"] = []
+        state["_dirty_cells"] = set()
+        return state
 
     @property
     def gamemap(self) -> GameMap:
         return self
 
+    @property
+    def nbytes(self) -> int:
+        """Roughly how much memory this map uses, counting its arrays and about 1 KiB an entity."""
+        arrays = sum(value.nbytes for value in self.__dict__.values() if isinstance(value, np.ndarray))
+        return arrays + 1024 * len(self.entities)
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Return the location index for this map, building it on first use."""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.entities)
+        return self._spatial_index
+
+    @property
+    def entity_store(self) -> EntityStore:
+        """
+        Return the columnar entity store for this map, building it on first use.
+
+        Entities are given slots in order of position, as the order of the `entities` set changes
+        from run to run.
+        """
+        if self._entity_store is None:
+            self._entity_store = EntityStore(
+                sorted(self.entities, key=lambda entity: (entity.y, entity.x, entity.name))
+            )
+        return self._entity_store
+
+    @property
+    def path_cost(self) -> np.ndarray:
+        """
+        Return the pathfinding cost of each tile, building it on first use.
+
+        Walls cost 0 (impassable), open floor costs 1, and floor occupied by a blocking entity
+        costs 11. A lower extra cost means more enemies will crowd behind each other in hallways,
+        a higher one means enemies will take longer paths in order to surround the player.
+        The array is updated in place as entities move, so callers must not modify it.
+        """
+        if self._path_cost is None:
+            self._path_cost = np.array(self.tiles["walkable"], dtype=np.int8, order="F")
+            for x, y in self.spatial_index.cells:
+                self._refresh_path_cost(x, y)
+        return self._path_cost
+
+    def _refresh_path_cost(self, x: int, y: int) -> None:
+        if self._path_cost is not None and self.tiles["walkable"][x, y]:
+            self._path_cost[x, y] = 11 if self.spatial_index.blocker_at(x, y) else 1
+
+    def mark_tiles_changed(self, window: Optional[Tuple[slice, slice]] = None) -> None:
+        """
+        Call after editing `tiles` so that anything derived from them is rebuilt.
+
+        If only the tiles in `window` were edited, the path costs are patched there instead.
+        """
+        self.tiles_version += 1
+        self._player_flow_field = None
+        if window is None or self._path_cost is None:
+            self._path_cost = None
+            return
+
+        x_window, y_window = window
+        self._path_cost[window] = self.tiles["walkable"][window]
+        for x, y in self.spatial_index.cells:
+            if x_window.start <= x < x_window.stop and y_window.start <= y < y_window.stop:
+                self._refresh_path_cost(x, y)
+
+    def invalidate_flow_field(self) -> None:
+        """Drop the flow field toward the player, it will be recomputed when next needed."""
+        self._player_flow_field = None
+
+    def get_path_to_player(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Return a path from (x, y) to the player, excluding the starting point.
+
+        Every chaser shares one Dijkstra map rooted at the player, built lazily the first time it
+        is needed after being invalidated, and each path is read off it by walking downhill.
+        If there is no valid path then returns an empty list.
+        """
+        if self._player_flow_field is None:
+            window = self._flow_field_window = self.pathing_window()
+            graph = tcod.path.SimpleGraph(cost=self.path_cost[window], cardinal=2, diagonal=3)
+            self._player_flow_field = tcod.path.Pathfinder(graph)
+            self._player_flow_field.add_root(
+                (self.engine.player.x - window[0].start, self.engine.player.y - window[1].start)
+            )
+
+        x_window, y_window = self._flow_field_window
+        if not (x_window.start <= x < x_window.stop and y_window.start <= y < y_window.stop):
+            return []
+        path: List[List[int]] = self._player_flow_field.path_from(
+            (x - x_window.start, y - y_window.start)
+        )[1:].tolist()
+
+        return [(index[0] + x_window.start, index[1] + y_window.start) for index in path]
+
+    def pathing_window(self) -> Tuple[slice, slice]:
+        """Return the area monsters search for paths to the player in, which is the whole map."""
+        return slice(0, self.width), slice(0, self.height)
+
+    def _mark_cell_dirty(self, x: int, y: int) -> None:
+        if self._frame is not None:
+            self._dirty_cells.add((x, y))
+
+    def add_entity(self, entity: Entity) -> None:
+        """Add an entity to this map at its current position."""
+        # Build the index and store first if needed, so the entity is not added to them twice.
+        spatial_index, entity_store = self.spatial_index, self.entity_store
+        self.entities.add(entity)
+        spatial_index.add(entity)
+        entity_store.add(entity)
+        self._refresh_path_cost(entity.x, entity.y)
+        self._mark_cell_dirty(entity.x, entity.y)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """Remove an entity from this map."""
+        self.spatial_index.remove(entity)
+        self.entity_store.remove(entity)
+        self.entities.remove(entity)
+        self._refresh_path_cost(entity.x, entity.y)
+        self._mark_cell_dirty(entity.x, entity.y)
+
+    def move_entity(self, entity: Entity, x: int, y: int) -> None:
+        """Move an entity on this map to a new position, keeping the index up to date."""
+        self.spatial_index.remove(entity)
+        self._refresh_path_cost(entity.x, entity.y)
+        self._mark_cell_dirty(entity.x, entity.y)
+        entity.x = x
+        entity.y = y
+        self.spatial_index.add(entity)
+        self.entity_store.move(entity)
+        self._refresh_path_cost(x, y)
+        self._mark_cell_dirty(x, y)
+        if entity is self.engine.player:
+            self.invalidate_flow_field()
+
+    def update_entity(self, entity: Entity) -> None:
+        """Refresh the index and store after an entity changes in place, such as when it dies."""
+        self.spatial_index.refresh_blocking(entity.x, entity.y)
+        self.entity_store.update(entity)
+        self._refresh_path_cost(entity.x, entity.y)
+        self._mark_cell_dirty(entity.x, entity.y)
+
     @property
     def actors(self) -> Iterator[Actor]:
         """Iterate over this maps living actors"""
@@ -48,58 +234,297 @@ class GameMap:
     def items(self) -> Iterator[Item]:
         yield from (entity for entity in self.entities if isinstance(entity, Item))
 
+    def get_entities_at_location(self, x: int, y: int) -> List[Entity]:
+        """Return every entity at the given location, in order of name so the order is stable."""
+        return sorted(self.spatial_index.entities_at(x, y), key=lambda entity: entity.name)
+
     def get_blocking_entity_at_location(
         self, location_x: int, location_y: int
     ) -> Optional[Entity]:
-        for entity in self.entities:
-            if (
-                entity.blocks_movement
-                and entity.x == location_x
-                and entity.y == location_y
-            ):
-                return entity
-
-        return None
+        return self.spatial_index.blocker_at(location_x, location_y)
     
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
-                return actor
+        for entity in self.spatial_index.entities_at(x, y):
+            if isinstance(entity, Actor) and entity.is_alive:
+                return entity
         
         return None
 
+    def get_actors_in_radius(self, x: int, y: int, radius: float) -> List[Actor]:
+        """Return the living actors within `radius` of the given (x, y) coordinate."""
+        return self.entity_store.actors_in_radius(x, y, radius)
+
+    def get_nearest_visible_actors(
+        self, x: int, y: int, k: int, max_distance: float, exclude: Optional[Entity] = None
+    ) -> List[Actor]:
+        """Return up to `k` visible living actors closer than `max_distance`, nearest first."""
+        return self.entity_store.nearest_actors(
+            x, y, k, max_distance, visible=self.visible, exclude=exclude
+        )
+
+    def get_nearest_visible_actor(
+        self, x: int, y: int, max_distance: float, exclude: Optional[Entity] = None
+    ) -> Optional[Actor]:
+        """Return the nearest visible living actor closer than `max_distance`, if any."""
+        actors = self.get_nearest_visible_actors(x, y, 1, max_distance, exclude)
+        return actors[0] if actors else None
+
+    def update_fov(self, x: int, y: int, radius: int) -> bool:
+        """
+        Recompute the visible area from (x, y), returning False if nothing could have changed.
+
+        The FOV is skipped when neither the point of view nor the tiles changed since the last
+        computation. Otherwise only the square within `radius` is computed, and only the
+        previous and new squares of `visible` and `explored` are touched.
+        """
+        key = (x, y, self.tiles_version)
+        if key == self._fov_key:
+            return False
+
+        window = (
+            slice(max(0, x - radius), min(self.width, x + radius + 1)),
+            slice(max(0, y - radius), min(self.height, y + radius + 1)),
+        )
+        fov = compute_fov(
+            self.tiles["transparent"][window],
+            (x - window[0].start, y - window[1].start),
+            radius=radius,
+        )
+
+        self.visible[self._fov_window] = False
+        self.visible[window] = fov
+        # If a tile is visible it should be added to explored
+        self.explored[window] |= fov
+
+        if self._frame is not None:
+            self._dirty_windows += [self._fov_window, window]
+
+        self._fov_key = key
+        self._fov_window = window
+        return True
+
     def in_bounds(self, x: int, y: int) -> bool:
         """Return True if x and y are inside of the bounds of this map"""
         return 0 <= x < self.width and 0 <= y < self.height
 
-    def render(self, console: Console) -> None:
+    def render(self, console: Console, view: Optional[Tuple[slice, slice]] = None) -> None:
         """
-        Renders the map.
+        Renders the part of the map in `view` to the top left of the console, or the whole map if
+        no view is given.
 
         If a tile is in the "visible" array, then draw it with the "light" colors.
         If it isn't, but it's in the "explored" array, then draw it with the "dark" colors.
         Otherwise, the default is "SHROUD".
+
+        The result is cached between frames. Tile changes and moving the view rebuild the whole
+        frame, while FOV updates and entity changes only recomposite the areas they touched.
         """
-        console.rgb[0 : self.width, 0 : self.height] = np.select(
-            condlist=[self.visible, self.explored],
-            choicelist=[self.tiles["light"], self.tiles["dark"]],
+        if view is None:
+            view = (slice(0, self.width), slice(0, self.height))
+
+        if (
+            self._frame is None
+            or self._frame_tiles_version != self.tiles_version
+            or self._frame_view != view
+        ):
+            self._frame_view = view
+            self._tile_layer = self._compose_tiles(view)
+            self._frame = self._tile_layer.copy()
+            self._draw_entities(view)
+            self._frame_tiles_version = self.tiles_version
+        else:
+            for window in self._dirty_windows:
+                window = self._clip_to_view(window)
+                local = self._to_frame(window)
+                self._tile_layer[local] = self._compose_tiles(window)
+                self._frame[local] = self._tile_layer[local]
+                self._draw_entities(window)
+            for x, y in self._dirty_cells:
+                x_view, y_view = view
+                if x_view.start <= x < x_view.stop and y_view.start <= y < y_view.stop:
+                    local_xy = x - x_view.start, y - y_view.start
+                    self._frame[local_xy] = self._tile_layer[local_xy]
+                    self._draw_entity_at(x, y)
+
+        self._dirty_windows = []
+        self._dirty_cells = set()
+
+        width, height = self._frame.shape
+        console.rgb[0:width, 0:height] = self._frame
+
+    def _clip_to_view(self, window: Tuple[slice, slice]) -> Tuple[slice, slice]:
+        """Return the part of a window inside the cached frame's view, which may be empty."""
+        x_start = max(window[0].start, self._frame_view[0].start)
+        y_start = max(window[1].start, self._frame_view[1].start)
+        return (
+            slice(x_start, max(x_start, min(window[0].stop, self._frame_view[0].stop))),
+            slice(y_start, max(y_start, min(window[1].stop, self._frame_view[1].stop))),
+        )
+
+    def _to_frame(self, window: Tuple[slice, slice]) -> Tuple[slice, slice]:
+        """Convert a window in map coordinates to one in cached frame coordinates."""
+        x_origin, y_origin = self._frame_view[0].start, self._frame_view[1].start
+        return (
+            slice(window[0].start - x_origin, window[0].stop - x_origin),
+            slice(window[1].start - y_origin, window[1].stop - y_origin),
+        )
+
+    def _compose_tiles(self, window: Tuple[slice, slice]) -> np.ndarray:
+        return np.select(
+            condlist=[self.visible[window], self.explored[window]],
+            choicelist=[self.tiles["light"][window], self.tiles["dark"][window]],
             default=tile_types.SHROUD
         )
 
-        entities_sorted_for_rendering = sorted(
-            self.entities, key=lambda x: x.render_order.value
+    def _draw_entities(self, window: Tuple[slice, slice]) -> None:
+        """Draw every visible entity within the window onto the cached frame."""
+        store = self.entity_store
+        x_origin, y_origin = self._frame_view[0].start, self._frame_view[1].start
+
+        # Higher layers are drawn later, so they end up on top.
+        for slots in store.visible_layers(self.visible, window):
+            xs, ys = store.x[slots] - x_origin, store.y[slots] - y_origin
+            self._frame["ch"][xs, ys] = store.char[slots]
+            self._frame["fg"][xs, ys] = store.color[slots]
+
+    def _draw_entity_at(self, x: int, y: int) -> None:
+        """Draw the topmost entity on a single tile onto the cached frame, if it is visible."""
+        entities = self.spatial_index.entities_at(x, y)
+        if entities and self.visible[x, y]:
+            entity = max(entities, key=lambda entity: entity.render_order.value)
+            local_xy = x - self._frame_view[0].start, y - self._frame_view[1].start
+            self._frame["ch"][local_xy] = ord(entity.char)
+            self._frame["fg"][local_xy] = entity.color
+
+
+class ChunkedGameMap(GameMap):
+    """
+    A map which can be much larger than the screen, split into square chunks of `chunk_size` tiles
+    which are only generated once the player comes within `load_radius` chunks of them.
+
+    Ungenerated chunks are solid wall, so the FOV, pathfinding and monsters are naturally limited
+    to the loaded chunks. Monster paths are further limited to the chunks around the player.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        width: int,
+        height: int,
+        *,
+        chunk_size: int,
+        floor_number: int,
+        seed_key: str,
+        max_rooms: int,
+        room_min_size: int,
+        room_max_size: int,
+        load_radius: int = 1,
+    ):
+        if width % chunk_size or height % chunk_size:
+            raise ValueError(f"A {width}x{height} map can not be split into {chunk_size} tile chunks.")
+        if chunk_size < room_max_size + 2:
+            raise ValueError(f"Chunks of {chunk_size} tiles are too small for the largest rooms.")
+        super().__init__(engine, width, height)
+
+        self.chunk_size = chunk_size
+        self.load_radius = load_radius
+        self.floor_number = floor_number
+        # Every random stream used to generate this map is derived from this.
+        self.seed_key = seed_key
+        self.max_rooms = max_rooms
+        self.room_min_size = room_min_size
+        self.room_max_size = room_max_size
+
+        self.generated = np.zeros((width // chunk_size, height // chunk_size), dtype=bool)
+        self.stairs_chunk = (0, 0)
+        # The stairs are not anywhere until their chunk is generated.
+        self.downstairs_location = (-1, -1)
+
+    def chunk_in_bounds(self, chunk_x: int, chunk_y: int) -> bool:
+        chunks_x, chunks_y = self.generated.shape
+        return 0 <= chunk_x < chunks_x and 0 <= chunk_y < chunks_y
+
+    def chunk_bounds(self, chunk_x: int, chunk_y: int) -> Tuple[slice, slice]:
+        """Return the tiles of a chunk as a 2D array index."""
+        size = self.chunk_size
+        return (
+            slice(chunk_x * size, (chunk_x + 1) * size),
+            slice(chunk_y * size, (chunk_y + 1) * size),
+        )
+
+    def _chunks_around(self, x: int, y: int) -> Tuple[slice, slice]:
+        """Return the chunks within `load_radius` of the chunk holding (x, y)."""
+        chunks_x, chunks_y = self.generated.shape
+        chunk_x, chunk_y = x // self.chunk_size, y // self.chunk_size
+        return (
+            slice(max(0, chunk_x - self.load_radius), min(chunks_x, chunk_x + self.load_radius + 1)),
+            slice(max(0, chunk_y - self.load_radius), min(chunks_y, chunk_y + self.load_radius + 1)),
         )
 
-        for entity in entities_sorted_for_rendering:
-            if self.visible[entity.x, entity.y]:
-                console.print(
-                    x=entity.x, y=entity.y, string=entity.char, fg=entity.color
-                )
+    def ensure_chunks_around(self, x: int, y: int) -> None:
+        """Generate any chunks within `load_radius` of (x, y) which have not been generated yet."""
+        from procgen import generate_chunk
+
+        x_chunks, y_chunks = self._chunks_around(x, y)
+        if self.generated[x_chunks, y_chunks].all():
+            return
+
+        spawned: List[Entity] = []
+        for chunk_x in range(x_chunks.start, x_chunks.stop):
+            for chunk_y in range(y_chunks.start, y_chunks.stop):
+                if not self.generated[chunk_x, chunk_y]:
+                    self.generated[chunk_x, chunk_y] = True
+                    spawned += generate_chunk(self, chunk_x, chunk_y)
+
+        # Tunnels to neighboring chunks may reach one chunk further than the new ones.
+        size = self.chunk_size
+        self.mark_tiles_changed(
+            (
+                slice(max(0, (x_chunks.start - 1) * size), (x_chunks.stop + 1) * size),
+                slice(max(0, (y_chunks.start - 1) * size), (y_chunks.stop + 1) * size),
+            )
+        )
+
+        # Monsters in new chunks sleep until the player comes near. A map still being generated
+        # ahead of time has its monsters scheduled once the player arrives instead.
+        if getattr(self.engine, "game_map", None) is self:
+            for entity in spawned:
+                if isinstance(entity, Actor):
+                    self.engine.scheduler.add_dormant(entity)
+
+    def move_entity(self, entity: Entity, x: int, y: int) -> None:
+        super().move_entity(entity, x, y)
+        if entity is self.engine.player:
+            self.ensure_chunks_around(x, y)
+
+    def pathing_window(self) -> Tuple[slice, slice]:
+        """Return the loaded chunks around the player, which monsters search for paths in."""
+        player = self.engine.player
+        x_chunks, y_chunks = self._chunks_around(player.x, player.y)
+        size = self.chunk_size
+        return (
+            slice(x_chunks.start * size, x_chunks.stop * size),
+            slice(y_chunks.start * size, y_chunks.stop * size),
+        )
 
 
 class GameWorld:
     """
     Holds the settings for the GameMap, and generates new maps when moving down the stairs.
+
+    The `ai_*` settings control which monsters spend time thinking. Monsters within
+    `ai_active_radius` of the player (or in sight) act every turn, explored areas out to
+    `ai_dormant_radius` act every `ai_reduced_tick_interval` turns, and everything else is dormant
+    until the player comes close or a fight within `ai_noise_radius` wakes it.
+
+    All randomness comes from streams derived from the master `seed`: one per floor for map
+    generation, and one per subsystem (such as "ai") for everything else. The streams are saved
+    with the game, so a given seed plays out the same way every time, and the floors do not depend
+    on what happened on earlier ones. If `pregenerate` is set, the next floor is generated on a
+    worker thread while the player explores the current one, and descending just swaps it in.
+
+    If `chunk_size` is set, floors are ChunkedGameMaps which are generated a chunk at a time as
+    they are explored, and `max_rooms` is the room budget of each chunk.
     """
 
     def __init__(
@@ -111,7 +536,15 @@ class GameWorld:
         max_rooms: int,
         room_min_size: int,
         room_max_size: int,
-        current_floor: int = 0
+        current_floor: int = 0,
+        ai_active_radius: int = 12,
+        ai_dormant_radius: int = 30,
+        ai_reduced_tick_interval: int = 3,
+        ai_noise_radius: int = 10,
+        seed: Optional[int] = None,
+        pregenerate: bool = True,
+        chunk_size: Optional[int] = None,
+        floor_memory_budget: int = 64 * 1024 * 1024,
     ):
         self.engine = engine
 
@@ -122,19 +555,119 @@ class GameWorld:
 
         self.room_min_size = room_min_size
         self.room_max_size = room_max_size
+        self.chunk_size = chunk_size
 
         self.current_floor = current_floor
 
-    def generate_floor(self) -> None:
-        from procgen import generate_dungeon
+        self.ai_active_radius = ai_active_radius
+        self.ai_dormant_radius = ai_dormant_radius
+        self.ai_reduced_tick_interval = ai_reduced_tick_interval
+        self.ai_noise_radius = ai_noise_radius
+
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng_streams: Dict[str, random.Random] = {}
+        self.pregenerate = pregenerate
+        # How long the last change of floor took, in seconds.
+        self.last_floor_latency = 0.0
+        # The floors the player has left, to go back to by the stairs.
+        self.floors = FloorCache(engine, floor_memory_budget)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Tuple[int, Future[GameMap]]] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # A floor being generated in the background is simply generated again after loading, which
+        # gives the same result since it is seeded.
+        state["_executor"] = None
+        state["_pending"] = None
+        return state
+
+    def floor_rng(self, floor: int) -> random.Random:
+        """Return a new random stream for generating the given floor."""
+        return random.Random(f"{self.seed}:floor:{floor}")
 
-        self.current_floor += 1
+    def rng(self, subsystem: str) -> random.Random:
+        """Return the random stream for a subsystem, such as "ai" or "combat"."""
+        stream = self.rng_streams.get(subsystem)
+        if stream is None:
+            stream = self.rng_streams[subsystem] = random.Random(f"{self.seed}:{subsystem}")
+        return stream
 
-        self.engine.game_map = generate_dungeon(
+    def _generate(self, floor: int) -> GameMap:
+        from procgen import generate_chunked_dungeon, generate_dungeon
+
+        if self.chunk_size:
+            return generate_chunked_dungeon(
+                max_rooms=self.max_rooms,
+                room_min_size=self.room_min_size,
+                room_max_size=self.room_max_size,
+                map_width=self.map_width,
+                map_height=self.map_height,
+                chunk_size=self.chunk_size,
+                engine=self.engine,
+                floor_number=floor,
+                rng=self.floor_rng(floor),
+            )
+        return generate_dungeon(
             max_rooms=self.max_rooms,
             room_min_size=self.room_min_size,
             room_max_size=self.room_max_size,
             map_width=self.map_width,
             map_height=self.map_height,
             engine=self.engine,
-        )
\ No newline at end of file
+            floor_number=floor,
+            rng=self.floor_rng(floor),
+        )
+
+    def pregenerate_floor(self, floor: int) -> None:
+        """Start generating a floor on the worker thread, if it is not already underway."""
+        if self._pending and self._pending[0] == floor:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="procgen")
+        self._pending = (floor, self._executor.submit(self._generate, floor))
+
+    def _take_floor(self, floor: int) -> GameMap:
+        """Return the given floor, waiting for the worker if it is being generated already."""
+        pending, self._pending = self._pending, None
+        if pending and pending[0] == floor:
+            return pending[1].result()
+        return self._generate(floor)
+
+    def _change_floor(self, floor: int, game_map: GameMap, location: Tuple[int, int]) -> None:
+        """Move the player to `location` on another floor, keeping the floor they left."""
+        old_floor, old_map = self.current_floor, getattr(self.engine, "game_map", None)
+
+        self.current_floor = floor
+        self.engine.game_map = game_map
+        self.engine.player.place(*location, game_map)
+        if old_map is not None:
+            self.floors.put(old_floor, old_map)
+        self.engine.schedule_floor()
+
+    def generate_floor(self) -> None:
+        """Go down to the next floor, generating it unless it was visited before."""
+        start = time.perf_counter()
+
+        floor = self.current_floor + 1
+        game_map = self.floors.take(floor)
+        if game_map is None:
+            game_map = self._take_floor(floor)
+        self._change_floor(floor, game_map, game_map.entry_location)
+
+        self.last_floor_latency = time.perf_counter() - start
+
+        if self.pregenerate and floor + 1 not in self.floors:
+            self.pregenerate_floor(floor + 1)
+
+    def ascend(self) -> None:
+        """Go back up to the previous floor, arriving on its stairs down."""
+        start = time.perf_counter()
+
+        floor = self.current_floor - 1
+        game_map = self.floors.take(floor)
+        assert game_map is not None, f"Floor {floor} was never visited."
+        self._change_floor(floor, game_map, game_map.downstairs_location)
+
+        self.last_floor_latency = time.perf_counter() - start
\ No newline at end of file
@@ -14,6 +14,7 @@ from actions import (
     PickupAction,
     WaitAction,
 )
+import checkpoint
 import color
 import exceptions
 
@@ -138,12 +139,6 @@ class EventHandler(BaseEventHandler):
             return MainGameEventHandler(self.engine) # Return to the main handler.
         return self
 
-    def update_ability_cooldowns(self):
-        """Update all ability cooldowns."""
-        for item in self.engine.player.inventory.items:
-            if hasattr(item, 'ability') and item.ability:
-                item.ability.cooldown()
-
     def handle_action(self, action: Optional[Action]) -> bool:
         """Handle actions returned from event methods.
         
@@ -159,16 +154,19 @@ class EventHandler(BaseEventHandler):
             return False # Skip enemy turn on exceptions.
         
         self.engine.handle_enemy_turns()
-        self.update_ability_cooldowns()
+        self.engine.end_turn()
 
         self.engine.update_fov() # Update the FOV before the players next action.
+        if self.engine.autosaver and self.engine.player.is_alive:
+            self.engine.autosaver.on_turn()
         return True
     
 
 
     def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
-        if self.engine.game_map.in_bounds(event.tile.x, event.tile.y):
-            self.engine.mouse_location = event.tile.x, event.tile.y
+        map_location = self.engine.camera.screen_to_map(event.tile.x, event.tile.y)
+        if map_location:
+            self.engine.mouse_location = map_location
     
     def on_render(self, console: tcod.console.Console) -> None:
         self.engine.render(console)
@@ -440,7 +438,7 @@ class SelectIndexHandler(AskUserEventHandler):
     def on_render(self, console: tcod.console.Console) -> None:
         """Highlight the tile under the cursor."""
         super().on_render(console)
-        x, y = self.engine.mouse_location
+        x, y = self.engine.camera.map_to_screen(*self.engine.mouse_location)
         console.rgb["bg"][x, y] = color.white
         console.rgb["fg"][x, y] = color.black
 
@@ -460,9 +458,10 @@ class SelectIndexHandler(AskUserEventHandler):
             dx, dy = MOVE_KEYS[key]
             x += dx * modifier
             y += dy * modifier
-            # Clamp the cursor index to the map size.
-            x = max(0, min(x, self.engine.game_map.width - 1))
-            y = max(0, min(y, self.engine.game_map.height - 1))
+            # Clamp the cursor index to the part of the map on screen.
+            view_x, view_y = self.engine.camera.view
+            x = max(view_x.start, min(x, view_x.stop - 1))
+            y = max(view_y.start, min(y, view_y.stop - 1))
             self.engine.mouse_location = x, y
             return None
         elif key in CONFIRM_KEYS:
@@ -473,9 +472,10 @@ class SelectIndexHandler(AskUserEventHandler):
         self, event: tcod.event.MouseButtonDown
     ) -> Optional[ActionOrHandler]:
         """Left click confirms a selection."""
-        if self.engine.game_map.in_bounds(*event.tile):
+        map_location = self.engine.camera.screen_to_map(*event.tile)
+        if map_location:
             if event.button == 1:
-                return self.on_index_selected(*event.tile)
+                return self.on_index_selected(*map_location)
         return super().ev_mousebuttondown(event)
     
     def on_index_selected(self, x: int, y: int) -> Optional[ActionOrHandler]:
@@ -523,7 +523,7 @@ class AreaRangedAttackHandler(SelectIndexHandler):
         """Highlight the tile under the cursor."""
         super().on_render(console)
 
-        x, y = self.engine.mouse_location
+        x, y = self.engine.camera.map_to_screen(*self.engine.mouse_location)
         
         # Draw a rectangle around the targeted area, so the player can see the affected tiles.
         console.draw_frame(
@@ -552,6 +552,10 @@ class MainGameEventHandler(EventHandler):
             tcod.event.KMOD_LSHIFT | tcod.event.KMOD_RSHIFT
         ):
             return actions.TakeStairsAction(player)
+        if key == tcod.event.KeySym.COMMA and modifier & (
+            tcod.event.KMOD_LSHIFT | tcod.event.KMOD_RSHIFT
+        ):
+            return actions.AscendStairsAction(player)
 
         if key in MOVE_KEYS:
             dx, dy = MOVE_KEYS[key]
@@ -583,8 +587,13 @@ class MainGameEventHandler(EventHandler):
 class GameOverEventHandler(EventHandler):
     def on_quit(self) -> None:
         """Handle exiting out of a finished game."""
-        if os.path.exists("savegame.sav"):
-            os.remove("savegame.sav") # Deletes the active save file.
+        autosaver = self.engine.autosaver
+        if autosaver:
+            autosaver.close()
+            # Deletes the active save file, which is the one the game was being autosaved to.
+            checkpoint.release_file(autosaver.filename)
+            if os.path.exists(autosaver.filename):
+                os.remove(autosaver.filename)
         raise exceptions.QuitWithoutSaving() # Avoid saving a finished game
 
     def ev_quit(self, event: tcod.event.Quit) -> None:
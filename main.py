@@ -12,7 +12,7 @@ import setup_game
 def save_game(handler: input_handlers.BaseEventHandler, filename: str) -> None:
     """If the current event handler has an active Engine then save it."""
     if isinstance(handler, input_handlers.EventHandler):
-        handler.engine.save_as(filename)
+        handler.engine.checkpoint(filename)
         print("Game saved.")
 
 
@@ -54,10 +54,10 @@ def main():
         except exceptions.QuitWithoutSaving:
             raise
         except SystemExit:  # Save and quit.
-            save_game(handler, "savegame.sav")
+            save_game(handler, setup_game.SAVE_FILENAME)
             raise
         except BaseException:  # Save on any other unexpected exception.
-            save_game(handler, "savegame.sav")
+            save_game(handler, setup_game.SAVE_FILENAME)
             raise
 
 
@@ -1,4 +1,4 @@
-from typing import Iterable, List, Reversible, Tuple
+from typing import Callable, Iterable, List, Optional, Reversible, Tuple
 import textwrap
 
 import tcod
@@ -22,7 +22,32 @@ class Message:
 
 class MessageLog:
     def __init__(self) -> None:
-        self.messages: List[Message] = []
+        # The most recent messages. A log loaded from a save may start with only the last few
+        # messages, with the `older_count` before them loaded by `load_older` when first needed.
+        self._messages: List[Message] = []
+        self.older_count = 0
+        self.load_older: Optional[Callable[[], List[Message]]] = None
+
+    def __getstate__(self) -> dict:
+        return {"_messages": self.messages, "older_count": 0, "load_older": None}
+
+    def __len__(self) -> int:
+        return self.older_count + len(self._messages)
+
+    @property
+    def messages(self) -> List[Message]:
+        """Every message, oldest first."""
+        if self.load_older is not None:
+            load_older, self.load_older = self.load_older, None
+            self._messages[:0] = load_older()
+            self.older_count = 0
+        return self._messages
+
+    def since(self, index: int) -> List[Message]:
+        """Return the messages from `index` on, only loading older messages if they are needed."""
+        if index < self.older_count:
+            return self.messages[index:]
+        return self._messages[index - self.older_count:]
     
     def add_message(
             self, text: str, fg: Tuple[int, int, int] = color.white, *, stack: bool = True,
@@ -33,10 +58,10 @@ class MessageLog:
         
         If `stack` is True then the message can stack with a previous message of the same text.
         """
-        if stack and self.messages and text == self.messages[-1].plain_text:
-            self.messages[-1].count += 1
+        if stack and self._messages and text == self._messages[-1].plain_text:
+            self._messages[-1].count += 1
         else:
-            self.messages.append(Message(text, fg))
+            self._messages.append(Message(text, fg))
     
     def render(
         self, console: tcod.console.Console, x: int, y: int, width: int, height: int,
@@ -45,7 +70,7 @@ class MessageLog:
         
         `x`, `y`, `width`, `height` is the rectangular region to render onto the `console`.
         """
-        self.render_messages(console, x, y, width, height, self.messages)
+        self.render_messages(console, x, y, width, height, self._messages)
     
     @staticmethod
     def wrap(string: str, width: int) -> Iterable[str]:
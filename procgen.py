@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import bisect
+import itertools
 import random
-from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
 
+import numpy as np # type: ignore
 import tcod
 
 import entity_factories
-from game_map import GameMap
+from game_map import ChunkedGameMap, GameMap
 import tile_types
 
 
@@ -302,45 +305,83 @@ enemy_chances: Dict[int, List[Tuple[Entity, int]]] = {
 }
 
 
-def get_max_value_for_floor(
-    weighted_chances_by_floor: List[Tuple[int, int]], floor: int
-) -> int:
-    current_value = 0
+class FloorTable:
+    """
+    A value which changes at certain floors, such as the most monsters a room can have.
 
-    for floor_minimum, value in weighted_chances_by_floor:
-        if floor_minimum > floor:
-            break
-        else:
-            current_value = value
-    
-    return current_value
+    `values_by_floor` holds (floor_number, value) pairs in ascending floor order, and each value
+    holds from its floor until the next one. Floors before the first entry have a value of 0.
+    """
 
+    def __init__(self, values_by_floor: List[Tuple[int, int]]):
+        self.floors = [floor for floor, _ in values_by_floor]
+        self.values = [value for _, value in values_by_floor]
+
+        if self.floors != sorted(set(self.floors)):
+            raise ValueError(f"Floors must be unique and in ascending order: {self.floors}")
+        if any(value < 0 for value in self.values):
+            raise ValueError(f"Values must not be negative: {self.values}")
+
+    def value_for(self, floor: int) -> int:
+        index = bisect.bisect_right(self.floors, floor)
+        return self.values[index - 1] if index else 0
 
-def get_entities_at_random(
-    weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]],
-    number_of_entities: int,
-    floor: int,
-) -> List[Entity]:
-    entity_weighted_chances = {}
 
-    for key, values in weighted_chances_by_floor.items():
-        if key > floor:
-            break
-        else:
-            for value in values:
-                entity = value[0]
-                weighted_chance = value[1]
+class SpawnTable:
+    """
+    Weighted spawn chances by floor, compiled into cumulative weights for every floor up front.
 
+    A floor uses the chances listed for it and for every floor before it, where a later floor
+    overrides the weight of an entity listed earlier.
+    """
+
+    def __init__(self, weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]]):
+        self.floors = list(weighted_chances_by_floor)
+        if self.floors != sorted(set(self.floors)):
+            raise ValueError(f"Floors must be unique and in ascending order: {self.floors}")
+
+        self._entities: List[List[Entity]] = []
+        self._cumulative_weights: List[List[int]] = []
+
+        entity_weighted_chances: Dict[Entity, int] = {}
+        for floor, chances in weighted_chances_by_floor.items():
+            for entity, weighted_chance in chances:
+                if weighted_chance < 0:
+                    raise ValueError(f"{entity.name} has a negative weight on floor {floor}.")
                 entity_weighted_chances[entity] = weighted_chance
 
-    entities = list(entity_weighted_chances.keys())
-    entity_weighted_chances_values = list(entity_weighted_chances.values())
+            cumulative_weights = list(itertools.accumulate(entity_weighted_chances.values()))
+            if not cumulative_weights or cumulative_weights[-1] <= 0:
+                raise ValueError(f"Floor {floor} has nothing that can spawn.")
+
+            self._entities.append(list(entity_weighted_chances))
+            self._cumulative_weights.append(cumulative_weights)
+
+    def choose(self, rng: random.Random, number_of_entities: int, floor: int) -> List[Entity]:
+        """Choose `number_of_entities` entities at random for the given floor."""
+        index = bisect.bisect_right(self.floors, floor)
+        if not index or number_of_entities <= 0:
+            return []
+        return rng.choices(
+            self._entities[index - 1],
+            cum_weights=self._cumulative_weights[index - 1],
+            k=number_of_entities,
+        )
+
+    def choose_for_rooms(
+        self, rng: random.Random, counts: List[int], floor: int
+    ) -> List[List[Entity]]:
+        """Choose entities for several rooms with one draw, `counts[i]` of them for room `i`."""
+        chosen = self.choose(rng, sum(counts), floor)
+        ends = list(itertools.accumulate(counts))
+        return [chosen[end - count:end] for count, end in zip(counts, ends)]
 
-    chosen_entities = random.choices(
-        entities, weights=entity_weighted_chances_values, k=number_of_entities
-    )
 
-    return chosen_entities
+# The tables above, compiled once. Building them checks that the tables are valid.
+max_items_table = FloorTable(max_items_by_floor)
+max_monsters_table = FloorTable(max_monsters_by_floor)
+item_table = SpawnTable(item_chances)
+enemy_table = SpawnTable(enemy_chances)
 
 
 class RectangularRoom:
@@ -361,6 +402,11 @@ class RectangularRoom:
     def inner(self) -> Tuple[slice, slice]:
         """Return the inner area of this room as a 2D array index."""
         return slice(self.x1 + 1, self.x2), slice(self.y1 + 1, self.y2)
+
+    @property
+    def footprint(self) -> Tuple[slice, slice]:
+        """Return the whole room including its walls as a 2D array index."""
+        return slice(self.x1, self.x2 + 1), slice(self.y1, self.y2 + 1)
     
     def intersects(self, other: RectangularRoom) -> bool:
         """Return True if this room overlaps with another RectangularRoom."""
@@ -373,37 +419,44 @@ class RectangularRoom:
 
 
 def place_entities(
-    room: RectangularRoom, dungeon: GameMap, floor_number: int,
-) -> None:
-    number_of_monsters = random.randint(
-        0, get_max_value_for_floor(max_monsters_by_floor, floor_number)
-    )
-    number_of_items = random.randint(
-        0, get_max_value_for_floor(max_items_by_floor, floor_number)
-    )
+    rooms: List[RectangularRoom], dungeon: GameMap, floor_number: int, rng: random.Random,
+) -> List[Entity]:
+    """
+    Spawn the monsters and items for every room, choosing all of them in one draw per table.
 
-    monsters: List[Entity] = get_entities_at_random(
-        enemy_chances, number_of_monsters, floor_number
-    )
-    items: List[Entity] = get_entities_at_random(
-        item_chances, number_of_items, floor_number
-    )
+    Returns the spawned entities.
+    """
+    max_monsters = max_monsters_table.value_for(floor_number)
+    max_items = max_items_table.value_for(floor_number)
 
-    for entity in monsters + items:
-        x = random.randint(room.x1 + 1, room.x2 - 1)
-        y = random.randint(room.y1 + 1, room.y2 - 1)
-        
-        if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
-            entity.spawn(dungeon, x, y)
+    monster_counts = [rng.randint(0, max_monsters) for _ in rooms]
+    item_counts = [rng.randint(0, max_items) for _ in rooms]
+
+    monsters = enemy_table.choose_for_rooms(rng, monster_counts, floor_number)
+    items = item_table.choose_for_rooms(rng, item_counts, floor_number)
+
+    spawned: List[Entity] = []
+    for room, room_monsters, room_items in zip(rooms, monsters, items):
+        for entity in room_monsters + room_items:
+            x = rng.randint(room.x1 + 1, room.x2 - 1)
+            y = rng.randint(room.y1 + 1, room.y2 - 1)
+
+            # Keep the player's arrival point clear, as the player is placed after generation.
+            if (x, y) == dungeon.entry_location:
+                continue
+            if not dungeon.get_entities_at_location(x, y):
+                spawned.append(entity.spawn(dungeon, x, y))
+
+    return spawned
 
 
 def tunnel_between(
-    start: Tuple[int, int], end: Tuple[int, int]
-) -> Iterator[Tuple[int, int]]:
-    """Return an L-shaped tunnel between these two points."""
+    start: Tuple[int, int], end: Tuple[int, int], rng: random.Random
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return an L-shaped tunnel between these two points, as a 2D array index."""
     x1, y1 = start
     x2, y2 = end
-    if random.random() < 0.5: # 50% chance
+    if rng.random() < 0.5: # 50% chance
         # Move horizontally, then vertically
         corner_x, corner_y = x2, y1
     else:
@@ -411,10 +464,21 @@ def tunnel_between(
         corner_x, corner_y = x1, y2
     
     # Generate the coordinates for this tunnel
-    for x, y in tcod.los.bresenham((x1, y1), (corner_x, corner_y)).tolist():
-        yield x, y
-    for x, y in tcod.los.bresenham((corner_x, corner_y), (x2, y2)).tolist():
-        yield x, y
+    points = np.concatenate(
+        [
+            tcod.los.bresenham((x1, y1), (corner_x, corner_y)),
+            tcod.los.bresenham((corner_x, corner_y), (x2, y2)),
+        ]
+    )
+    return points[:, 0], points[:, 1]
+
+
+def place_up_stairs(dungeon: GameMap, floor_number: int) -> None:
+    """Put stairs back up where the player arrives, on every floor below the first."""
+    if floor_number > 1:
+        dungeon.tiles[dungeon.entry_location] = tile_types.up_stairs
+        dungeon.upstairs_location = dungeon.entry_location
+
 
 def generate_dungeon(
     max_rooms: int,
@@ -423,51 +487,191 @@ def generate_dungeon(
     map_width: int,
     map_height: int,
     engine: Engine,
+    floor_number: int,
+    rng: random.Random,
 ) -> GameMap:
-    """Generate a new dungeon map."""
-    player = engine.player
-    dungeon = GameMap(engine, map_width, map_height, entities=[player])
+    """
+    Generate a new dungeon map.
+
+    All randomness comes from `rng`, and the engine's current state is not touched, so a floor can
+    be generated ahead of time on another thread. The player is left for the caller to place at
+    the map's `entry_location`.
+    """
+    dungeon = GameMap(engine, map_width, map_height)
 
     rooms: List[RectangularRoom] = []
+    # Every tile covered by an accepted room, walls included. A new room is rejected if any of its
+    # tiles are already taken, which is the same test as `intersects` against every room.
+    occupied = np.zeros((map_width, map_height), dtype=bool, order="F")
 
     center_of_last_room = (0, 0)
 
     for r in range(max_rooms):
         # Random width and height
-        room_width = random.randint(room_min_size, room_max_size)
-        room_height = random.randint(room_min_size, room_max_size)
+        room_width = rng.randint(room_min_size, room_max_size)
+        room_height = rng.randint(room_min_size, room_max_size)
 
         # Random position without going out of the boundaries of the map
-        x = random.randint(0, dungeon.width - room_width - 1)
-        y = random.randint(0, dungeon.height - room_height - 1)
+        x = rng.randint(0, dungeon.width - room_width - 1)
+        y = rng.randint(0, dungeon.height - room_height - 1)
         
         # "RectangularRoom" class makes rectangles easier to work with
         new_room = RectangularRoom(x, y, room_width, room_height)
 
-        # Run through the other rooms and see if they intersect with this one
-        if any(new_room.intersects(other_room) for other_room in rooms):
+        # Check whether this room overlaps any of the other rooms
+        if occupied[new_room.footprint].any():
             continue
         # If there are no intersections then the room is valid
+        occupied[new_room.footprint] = True
 
         # Dig out this room's inner area
         dungeon.tiles[new_room.inner] = tile_types.floor
 
         if len(rooms) == 0:
             # The first room, where the player starts
-            player.place(*new_room.center, dungeon)
+            dungeon.entry_location = new_room.center
         else: # All rooms after the first
             # Dig out a tunnel between this room and the previous one
-            for x, y in tunnel_between(rooms[-1].center, new_room.center):
-                dungeon.tiles[x, y] = tile_types.floor
+            dungeon.tiles[tunnel_between(rooms[-1].center, new_room.center, rng)] = tile_types.floor
 
             center_of_last_room = new_room.center
 
-        place_entities(new_room, dungeon, engine.game_world.current_floor)
-
         dungeon.tiles[center_of_last_room] = tile_types.down_stairs
         dungeon.downstairs_location = center_of_last_room
 
         # Finally, append the new room to the list
         rooms.append(new_room)
 
-    return dungeon
\ No newline at end of file
+    place_up_stairs(dungeon, floor_number)
+    dungeon.mark_tiles_changed()
+
+    place_entities(rooms, dungeon, floor_number, rng)
+
+    return dungeon
+
+
+def chunk_anchor(dungeon: ChunkedGameMap, chunk_x: int, chunk_y: int) -> Tuple[int, int]:
+    """
+    Return the center of the first room of a chunk.
+
+    It depends only on the floor's seed and the chunk, so a neighboring chunk can dig a tunnel to
+    it before the chunk itself is generated.
+    """
+    rng = random.Random(f"{dungeon.seed_key}:anchor:{chunk_x}:{chunk_y}")
+    half = dungeon.room_min_size // 2
+    x_window, y_window = dungeon.chunk_bounds(chunk_x, chunk_y)
+    return (
+        rng.randint(x_window.start + half + 1, x_window.stop - dungeon.room_min_size + half - 2),
+        rng.randint(y_window.start + half + 1, y_window.stop - dungeon.room_min_size + half - 2),
+    )
+
+
+def generate_chunk(dungeon: ChunkedGameMap, chunk_x: int, chunk_y: int) -> List[Entity]:
+    """
+    Generate one chunk of a chunked map, returning the entities spawned in it.
+
+    Rooms are laid out and joined inside the chunk much like `generate_dungeon`, starting from the
+    chunk's anchor room. Tunnels then join the anchor to those of the neighboring chunks.
+    """
+    rng = random.Random(f"{dungeon.seed_key}:chunk:{chunk_x}:{chunk_y}")
+    x_window, y_window = dungeon.chunk_bounds(chunk_x, chunk_y)
+    occupied = np.zeros(
+        (x_window.stop - x_window.start, y_window.stop - y_window.start), dtype=bool, order="F"
+    )
+
+    anchor_x, anchor_y = chunk_anchor(dungeon, chunk_x, chunk_y)
+    half = dungeon.room_min_size // 2
+    rooms = [
+        RectangularRoom(
+            anchor_x - half, anchor_y - half, dungeon.room_min_size, dungeon.room_min_size
+        )
+    ]
+
+    for r in range(dungeon.max_rooms):
+        room_width = rng.randint(dungeon.room_min_size, dungeon.room_max_size)
+        room_height = rng.randint(dungeon.room_min_size, dungeon.room_max_size)
+        x = rng.randint(x_window.start, x_window.stop - room_width - 1)
+        y = rng.randint(y_window.start, y_window.stop - room_height - 1)
+        rooms.append(RectangularRoom(x, y, room_width, room_height))
+
+    accepted: List[RectangularRoom] = []
+    for room in rooms:
+        footprint = room.footprint
+        local = (
+            slice(footprint[0].start - x_window.start, footprint[0].stop - x_window.start),
+            slice(footprint[1].start - y_window.start, footprint[1].stop - y_window.start),
+        )
+        if occupied[local].any():
+            continue
+        occupied[local] = True
+
+        dungeon.tiles[room.inner] = tile_types.floor
+        if accepted:
+            dungeon.tiles[tunnel_between(accepted[-1].center, room.center, rng)] = tile_types.floor
+        accepted.append(room)
+
+    # Join the anchor to each neighbor's anchor. Both chunks dig the same tunnel, whichever is
+    # generated first, since it is drawn from a stream shared by the pair.
+    for neighbor_x, neighbor_y in (
+        (chunk_x - 1, chunk_y), (chunk_x + 1, chunk_y), (chunk_x, chunk_y - 1), (chunk_x, chunk_y + 1)
+    ):
+        if not dungeon.chunk_in_bounds(neighbor_x, neighbor_y):
+            continue
+        first, second = sorted([(chunk_x, chunk_y), (neighbor_x, neighbor_y)])
+        edge_rng = random.Random(f"{dungeon.seed_key}:edge:{first}:{second}")
+        dungeon.tiles[
+            tunnel_between(chunk_anchor(dungeon, *first), chunk_anchor(dungeon, *second), edge_rng)
+        ] = tile_types.floor
+
+    if (chunk_x, chunk_y) == dungeon.stairs_chunk:
+        dungeon.downstairs_location = accepted[-1].center
+        dungeon.tiles[dungeon.downstairs_location] = tile_types.down_stairs
+
+    return place_entities(accepted, dungeon, dungeon.floor_number, rng)
+
+
+def generate_chunked_dungeon(
+    max_rooms: int,
+    room_min_size: int,
+    room_max_size: int,
+    map_width: int,
+    map_height: int,
+    chunk_size: int,
+    engine: Engine,
+    floor_number: int,
+    rng: random.Random,
+) -> ChunkedGameMap:
+    """
+    Generate a map split into chunks, where only the chunks around the player's arrival point are
+    generated up front. The rest are generated as the player comes near them.
+
+    `max_rooms` is the room budget of each chunk.
+    """
+    dungeon = ChunkedGameMap(
+        engine,
+        map_width,
+        map_height,
+        chunk_size=chunk_size,
+        floor_number=floor_number,
+        seed_key=f"{rng.getrandbits(64)}",
+        max_rooms=max_rooms,
+        room_min_size=room_min_size,
+        room_max_size=room_max_size,
+    )
+
+    chunks_x, chunks_y = dungeon.generated.shape
+    entry_chunk = (chunks_x // 2, chunks_y // 2)
+    dungeon.entry_location = chunk_anchor(dungeon, *entry_chunk)
+
+    # The stairs go in some other chunk, which has to be found.
+    stairs_chunk = entry_chunk
+    while stairs_chunk == entry_chunk and chunks_x * chunks_y > 1:
+        stairs_chunk = rng.randrange(chunks_x), rng.randrange(chunks_y)
+    dungeon.stairs_chunk = stairs_chunk
+
+    dungeon.ensure_chunks_around(*dungeon.entry_location)
+    place_up_stairs(dungeon, floor_number)
+    x, y = dungeon.entry_location
+    dungeon.mark_tiles_changed((slice(x, x + 1), slice(y, y + 1)))
+
+    return dungeon
@@ -0,0 +1,146 @@
+"""
+A sectioned binary save format.
+
+A save file starts with `MAGIC`, followed by the length of a JSON header and the header itself,
+then the data of each section back to back. The header lists every section's name, codec and
+length, so sections can be decoded independently:
+
+- "engine" is the pickled Engine, without its NumPy arrays or message log.
+- "buffer:N" is the raw data of the Nth NumPy array, such as the map's tiles, stored out of band
+  with pickle protocol 5 so it never has to be copied into the pickle stream.
+- "messages" is the message log as JSON.
+"""
+from __future__ import annotations
+
+import io
+import json
+import lzma
+import pickle
+import struct
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, List, Tuple, TYPE_CHECKING
+
+from message_log import Message, MessageLog
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+MAGIC = b"RLGSAVE1"
+HEADER_LENGTH = struct.Struct("<I")
+
+# Codec name: (compress, decompress).
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (bytes, bytes),
+    "zlib": (lambda data: zlib.compress(data, 1), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+DEFAULT_CODEC = "zlib"
+
+
+class _EnginePickler(pickle.Pickler):
+    """Leaves the message log out of the pickle, as it is saved in its own section."""
+
+    def __init__(self, file: BinaryIO, message_log: MessageLog, **kwargs: Any):
+        super().__init__(file, protocol=5, **kwargs)
+        self.message_log = message_log
+
+    def persistent_id(self, obj: Any) -> Any:
+        if obj is self.message_log:
+            return "message_log"
+        return None
+
+
+class _EngineUnpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, message_log: MessageLog, **kwargs: Any):
+        super().__init__(file, **kwargs)
+        self.message_log = message_log
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "message_log":
+            return self.message_log
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid!r}")
+
+
+def message_rows(messages: List[Message]) -> List[List[Any]]:
+    """Return messages as [text, fg, count] rows, which can be saved as JSON."""
+    return [[message.plain_text, message.fg, message.count] for message in messages]
+
+
+def message_log_from_rows(rows: List[List[Any]]) -> MessageLog:
+    message_log = MessageLog()
+    for text, fg, count in rows:
+        message = Message(text, tuple(fg))
+        message.count = count
+        message_log.messages.append(message)
+    return message_log
+
+
+def encode_messages(message_log: MessageLog) -> bytes:
+    return json.dumps(message_rows(message_log.messages)).encode()
+
+
+def decode_messages(data: bytes) -> MessageLog:
+    return message_log_from_rows(json.loads(data))
+
+
+def write_sections(file: BinaryIO, sections: List[Tuple[str, bytes]], codec: str) -> None:
+    """Write named sections to a file, compressing each with `codec`."""
+    compress = CODECS[codec][0]
+    encoded = [(name, compress(data)) for name, data in sections]
+    header = json.dumps(
+        {
+            "sections": [
+                {"name": name, "codec": codec, "length": len(data)} for name, data in encoded
+            ]
+        }
+    ).encode()
+
+    file.write(MAGIC)
+    file.write(HEADER_LENGTH.pack(len(header)))
+    file.write(header)
+    for _, data in encoded:
+        file.write(data)
+
+
+def read_sections(file: BinaryIO) -> Dict[str, bytearray]:
+    """Read and decompress every section of a file written by `write_sections`."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a save file.")
+    (header_length,) = HEADER_LENGTH.unpack(file.read(HEADER_LENGTH.size))
+    header = json.loads(file.read(header_length))
+
+    sections: Dict[str, bytearray] = {}
+    for section in header["sections"]:
+        decompress = CODECS[section["codec"]][1]
+        # Arrays are rebuilt on top of these buffers, so they must be writable.
+        sections[section["name"]] = bytearray(decompress(file.read(section["length"])))
+    return sections
+
+
+def dump_engine(engine: Engine, file: BinaryIO, codec: str = DEFAULT_CODEC) -> None:
+    buffers: List[pickle.PickleBuffer] = []
+    engine_data = io.BytesIO()
+    _EnginePickler(engine_data, engine.message_log, buffer_callback=buffers.append).dump(engine)
+
+    sections = [("engine", engine_data.getvalue())]
+    sections += [(f"buffer:{i}", buffer.raw()) for i, buffer in enumerate(buffers)]
+    sections.append(("messages", encode_messages(engine.message_log)))
+    write_sections(file, sections, codec)
+
+
+def load_engine(file: BinaryIO) -> Engine:
+    sections = read_sections(file)
+    buffers = []
+    while f"buffer:{len(buffers)}" in sections:
+        buffers.append(sections[f"buffer:{len(buffers)}"])
+
+    message_log = decode_messages(sections["messages"])
+    return _EngineUnpickler(
+        io.BytesIO(sections["engine"]), message_log, buffers=buffers
+    ).load()
+
+
+def is_save_file(filename: str) -> bool:
+    """Return True if the file is in this format, rather than an older pickled save."""
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
@@ -1,36 +1,48 @@
 """Handle the loading and initialization of game sessions."""
 from __future__ import annotations
 
-import copy
-import lzma
-import pickle
 import traceback
 from typing import Optional
 
 import tcod
 from tcod import libtcodpy
 
+import checkpoint
 import color
 from engine import Engine
 import entity_factories
 from game_map import GameWorld
 import input_handlers
+import save_format
 
 
+# The file games are saved to, and how many turns apart they are autosaved.
+SAVE_FILENAME = "savegame.sav"
+AUTOSAVE_INTERVAL = 20
+
 # Load the background image and remove the alpha channel.
 background_image = tcod.image.load("menu_background_4.png")[:, :, :3]
 
 
-def new_game() -> Engine:
-    """Return a brand new game session as an Engine instance."""
-    map_width = 80
-    map_height = 43
+def new_game(
+    seed: Optional[int] = None,
+    map_width: int = 80,
+    map_height: int = 43,
+    chunk_size: Optional[int] = None,
+) -> Engine:
+    """
+    Return a brand new game session as an Engine instance.
+
+    Passing a seed makes the whole game reproducible, otherwise a random one is picked.
+    Maps larger than the screen scroll with the player, and should set `chunk_size` so they are
+    generated a chunk at a time as they are explored.
+    """
 
     room_max_size = 10
     room_min_size = 6
     max_rooms = 30
 
-    player = copy.deepcopy(entity_factories.player)
+    player = entity_factories.player.clone()
 
     engine = Engine(player=player)
 
@@ -41,6 +53,8 @@ def new_game() -> Engine:
         room_max_size=room_max_size,
         map_width=map_width,
         map_height=map_height,
+        seed=seed,
+        chunk_size=chunk_size,
     )
 
     engine.game_world.generate_floor()
@@ -50,9 +64,9 @@ def new_game() -> Engine:
         "Hello and welcome, adventurer, to yet another dungeon!", color.welcome_text
     )
 
-    wrapped_fists = copy.deepcopy(entity_factories.wrapped_fists)
-    cloth_armor = copy.deepcopy(entity_factories.cloth_armor)
-    ability = copy.deepcopy(entity_factories.bow)
+    wrapped_fists = entity_factories.wrapped_fists.clone()
+    cloth_armor = entity_factories.cloth_armor.clone()
+    ability = entity_factories.bow.clone()
 
     wrapped_fists.parent = player.inventory
     cloth_armor.parent = player.inventory
@@ -70,9 +84,14 @@ def new_game() -> Engine:
 
 
 def load_game(filename: str) -> Engine:
-    """Load an Engine instance from a file."""
+    """Load an Engine instance from a checkpoint or a file written by `Engine.save_as`."""
+    if checkpoint.is_checkpoint_file(filename):
+        return checkpoint.load_checkpoint(filename)
+    if not save_format.is_save_file(filename):
+        # Older saves pickled the whole engine, whose classes have changed shape since.
+        raise ValueError("The save is from an older version of the game.")
     with open(filename, "rb") as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
+        engine = save_format.load_engine(f)
     assert isinstance(engine, Engine)
     return engine
 
@@ -120,13 +139,17 @@ class MainMenu(input_handlers.BaseEventHandler):
             raise SystemExit()
         elif event.sym == tcod.event.KeySym.c:
             try:
-                return input_handlers.MainGameEventHandler(load_game("savegame.sav"))
+                engine = load_game(SAVE_FILENAME)
             except FileNotFoundError:
                 return input_handlers.PopupMessage(self, "No saved game to load.")
             except Exception as exc:
                 traceback.print_exc() # Print to stderr.
                 return input_handlers.PopupMessage(self, f"Failed to load save:\n{exc}")
+            engine.enable_autosave(SAVE_FILENAME, AUTOSAVE_INTERVAL)
+            return input_handlers.MainGameEventHandler(engine)
         elif event.sym == tcod.event.KeySym.n:
-            return input_handlers.MainGameEventHandler(new_game())
+            engine = new_game()
+            engine.enable_autosave(SAVE_FILENAME, AUTOSAVE_INTERVAL)
+            return input_handlers.MainGameEventHandler(engine)
 
         return None
\ No newline at end of file
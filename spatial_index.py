@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Entity
+
+
+class SpatialIndex:
+    """
+    A per-map lookup from a cell to the entities standing on it.
+
+    `blockers` holds the entity which blocks movement on each occupied cell, so blocking checks
+    are a single lookup instead of a scan over every entity. It is a dict rather than an object
+    array, as the garbage collector cannot see into numpy arrays: an array holding entities, which
+    refer back to their map, would keep a map alive forever once it is left.
+    """
+
+    def __init__(self, entities: Iterable[Entity] = ()):
+        self.cells: Dict[Tuple[int, int], Set[Entity]] = {}
+        self.blockers: Dict[Tuple[int, int], Entity] = {}
+
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity: Entity) -> None:
+        """Index an entity at its current position."""
+        location = entity.x, entity.y
+        self.cells.setdefault(location, set()).add(entity)
+        if entity.blocks_movement:
+            self.blockers[location] = entity
+
+    def remove(self, entity: Entity) -> None:
+        """Remove an entity from the position it was indexed at."""
+        location = entity.x, entity.y
+        cell = self.cells[location]
+        cell.remove(entity)
+        if not cell:
+            del self.cells[location]
+        if self.blockers.get(location) is entity:
+            self.refresh_blocking(*location)
+
+    def refresh_blocking(self, x: int, y: int) -> None:
+        """Recompute the blocking occupant of a cell, after an entity stops or starts blocking."""
+        blocker = next(
+            (entity for entity in self.cells.get((x, y), ()) if entity.blocks_movement),
+            None,
+        )
+        if blocker is None:
+            self.blockers.pop((x, y), None)
+        else:
+            self.blockers[x, y] = blocker
+
+    def entities_at(self, x: int, y: int) -> Set[Entity]:
+        return self.cells.get((x, y), set())
+
+    def blocker_at(self, x: int, y: int) -> Optional[Entity]:
+        return self.blockers.get((x, y))
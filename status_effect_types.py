@@ -0,0 +1,9 @@
+from enum import auto, Enum
+
+
+class StatusEffectType(Enum):
+    CONFUSION = auto()
+    STUN = auto()
+    POISON = auto()
+    BURNING = auto()
+    HASTE = auto()
\ No newline at end of file
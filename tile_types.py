@@ -51,4 +51,10 @@ down_stairs = new_tile(
     transparent=True,
     dark=(ord(">"), (93, 71, 43), (140, 107, 64)),
     light=(ord(">"), (140, 107, 64), (187, 142, 85)),
-)
\ No newline at end of file
+)
+up_stairs = new_tile(
+    walkable=True,
+    transparent=True,
+    dark=(ord("<"), (93, 71, 43), (140, 107, 64)),
+    light=(ord("<"), (140, 107, 64), (187, 142, 85)),
+)
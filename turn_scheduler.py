@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Iterable, Iterator, List, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+# The time an actor at normal speed takes to act once.
+TURN_LENGTH = 100
+NORMAL_SPEED = 100
+
+
+def action_delay(actor: Actor) -> int:
+    """Return how much time passes between two actions of this actor."""
+    speed = actor.speed * actor.status_effects.speed_multiplier
+    return max(1, TURN_LENGTH * NORMAL_SPEED // max(1, speed))
+
+
+class TurnScheduler:
+    """
+    Orders actor turns with a heap keyed on the time each actor next acts.
+
+    Faster actors get shorter delays between actions, so they come up more often. Ties are broken
+    by the order actors were scheduled in, which keeps turn order deterministic.
+
+    Dormant actors are kept out of the heap entirely until they are woken up.
+    """
+
+    def __init__(self) -> None:
+        self.time = 0
+        self._queue: List[Tuple[int, int, Actor]] = []
+        self._counter = 0
+        self.dormant: Set[Actor] = set()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def reset(self, actors: Iterable[Actor]) -> None:
+        """Replace every scheduled actor, such as when moving to a new floor."""
+        self._queue = []
+        self.dormant = set()
+        for actor in actors:
+            self.schedule(actor)
+
+    def schedule(self, actor: Actor) -> None:
+        """Schedule an actor to act once a full delay has passed from now."""
+        self._push(self.time + action_delay(actor), actor)
+
+    def _push(self, next_time: int, actor: Actor) -> None:
+        self._counter += 1
+        heapq.heappush(self._queue, (next_time, self._counter, actor))
+
+    def add_dormant(self, actor: Actor) -> None:
+        """Add an actor which sleeps until it is woken up, such as one spawned out of sight."""
+        self.dormant.add(actor)
+
+    def wake(self, actor: Actor) -> None:
+        """Return a dormant actor to the heap."""
+        if actor in self.dormant:
+            self.dormant.remove(actor)
+            self.schedule(actor)
+
+    def advance(self, actor: Actor) -> None:
+        """Advance the clock by the time `actor` (normally the player) took to act."""
+        self.time += action_delay(actor)
+
+    def ready_actors(self, activity: Callable[[Actor], int]) -> Iterator[Actor]:
+        """
+        Yield each actor whose turn has come, in order.
+
+        `activity` returns how many turns an actor waits between actions: 1 acts every turn,
+        larger numbers act less often and 0 sends the actor dormant instead of acting.
+
+        An actor is rescheduled after it acts, so a fast actor may come up more than once.
+        Dead actors are dropped when they reach the front of the queue.
+        """
+        while self._queue and self._queue[0][0] <= self.time:
+            next_time, _, actor = heapq.heappop(self._queue)
+            if not actor.is_alive:
+                continue
+            interval = activity(actor)
+            if interval <= 0:
+                self.dormant.add(actor)
+                continue
+            yield actor
+            if actor.is_alive:
+                self._push(next_time + action_delay(actor) * interval, actor)